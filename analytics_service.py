@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Local analytics HTTP service
+Loads the draw history once and answers frequency, confidence interval,
+ticket evaluation and backtest requests from memory. Backtests (and big
+evaluations) run in a process pool so the event loop keeps serving
+
+Usage: python analytics_service.py [port] [workers]
+
+GET  /health
+GET  /frequency?source=results&last=100       (or from=2024-01-01&to=2024-12-31, both included)
+GET  /ci?method=wilson&confidence=0.95&correction=bonferroni&column=Num1   (correction=sidak|none, default bonferroni)
+GET  /evaluate?ticket=1,2,3,4,5,6
+GET  /backtest?tickets=1,2,3,4,5,6;7,8,9,10,11,12
+POST /backtest  {"tickets": [[1, 2, 3, 4, 5, 6], ...]}
+
+Every endpoint takes source=results (default) or source=simulated. Rows
+with errors in the data are skipped, the service never asks what to do
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import dataset
+from backtest import evaluate_tickets
+
+HOST = "127.0.0.1"
+PORT = 8765
+
+# Histories that can be queried (?source=)
+SOURCES = {"results": "toto_results.csv", "simulated": "simulated_draws.csv"}
+
+# Ticket x draw cells above which an evaluation is sent to the worker pool
+OFFLOAD_CELLS = 2_000_000
+MAX_TICKETS = 10000
+
+# Largest request body accepted, room for MAX_TICKETS tickets like "[49, 48, 47, 46, 45, 44], "
+MAX_BODY = MAX_TICKETS * 32 + 1024
+
+# Encoded responses of the in-memory endpoints, keyed by request and data fingerprint
+CACHE_SIZE = 256
+_responses = {}
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+
+class ServiceError(Exception):
+    """
+    Bad request, reported to the client with status 400
+    """
+
+
+
+def load_dataset(file):
+    """
+    Load and clean a source without prompting, in the service or a pool process
+    """
+    return dataset.get_dataset(file, prompt=False)
+
+
+
+async def get_data(params):
+    """
+    Shared dataset of the requested source (loaded once, reloaded if its file changed)
+
+    Loading and cleaning runs in a thread so a reload does not hold up the event loop
+    """
+    source = params.get("source", "results")
+    if source not in SOURCES:
+        raise ServiceError(f"source must be one of: {', '.join(SOURCES)}")
+    if not os.path.exists(SOURCES[source]):
+        raise ServiceError(f"{SOURCES[source]} not found")
+
+    file = SOURCES[source]
+    if dataset.is_loaded(file):
+        data = load_dataset(file)
+    else:
+        data = await asyncio.get_running_loop().run_in_executor(None, load_dataset, file)
+    if data is None:
+        raise ServiceError(f"{SOURCES[source]} could not be loaded")
+
+    return data
+
+
+
+def parse_int(params, name, default, low, high):
+    value = params.get(name)
+    if value is None:
+        return default
+    if not value.isdigit() or not low <= int(value) <= high:
+        raise ServiceError(f"{name} must be a whole number from {low} to {high}")
+    return int(value)
+
+
+
+def parse_ticket(value):
+    """
+    6 different numbers from 1-49, e.g. "1,2,3,4,5,6"
+    """
+    numbers = value.split(",") if isinstance(value, str) else value
+
+    try:
+        ticket = [int(n) for n in numbers]
+    except (TypeError, ValueError):
+        raise ServiceError(f"Invalid ticket: {value}")
+
+    if len(ticket) != 6 or len(set(ticket)) != 6 or not all(1 <= n <= 49 for n in ticket):
+        raise ServiceError(f"A ticket is 6 different numbers from 1-49, got {value}")
+
+    return sorted(ticket)
+
+
+
+async def frequency(params):
+    """
+    Counts of each number overall and per column, for all draws, the last N or a date range
+    (from and to both included)
+    """
+    data = await get_data(params)
+    cube = data.frequency_cube
+
+    if "from" in params or "to" in params:
+        if cube.dates is None:
+            raise ServiceError("This source has no dates")
+        counts = cube.date_window(params.get("from"), params.get("to"), include_end=True)
+    elif "last" in params:
+        counts = cube.window(-parse_int(params, "last", 0, 1, cube.draws))
+    else:
+        counts = data.position_counts
+
+    return {
+        "draws": int(counts[0].sum()),
+        "overall": counts.sum(axis=0)[1:].tolist(),
+        "columns": {name: counts[i, 1:].tolist() for i, name in enumerate(data.column_names)},
+    }
+
+
+
+async def confidence_intervals(params):
+    """
+    Confidence interval of every number's proportion in every column
+    """
+    from confidence_intervals import DEFAULT_CORRECTION, confidence_interval_table
+
+    data = await get_data(params)
+    try:
+        confidence = float(params.get("confidence", 0.95))
+        if not 0 < confidence < 1:
+            raise ValueError("confidence must be between 0 and 1, e.g. 0.95")
+        table = confidence_interval_table(data.position_counts, params.get("method", "wilson"),
+                                          confidence, params.get("correction", DEFAULT_CORRECTION))
+    except ValueError as e:
+        raise ServiceError(str(e))
+
+    if "column" in params:
+        table = table[table['column'] == params["column"]]
+
+    return {"draws": len(data), "intervals": table.to_dict(orient="records")}
+
+
+
+def evaluate_response(file, tickets):
+    """
+    Encoded evaluation of tickets against every draw of file
+
+    Runs inline or in a pool process (which keeps its own loaded copy of the
+    dataset). Building and encoding the response happens here too, so a big
+    backtest does not hold up the event loop
+    """
+    data = load_dataset(file)
+    prizes, matches = evaluate_tickets(data.numbers, tickets)
+
+    return encode({"draws": len(data), "results": [{
+        "ticket": ticket,
+        "prizes": {f"group_{group}": int(prizes[i, group]) for group in range(1, 8)},
+        "winning_draws": int(prizes[i, 1:].sum()),
+        "matches": matches[i].tolist(),
+        "average_matches": round(float(matches[i] @ np.arange(7) / max(matches[i].sum(), 1)), 4),
+    } for i, ticket in enumerate(tickets)]})
+
+
+
+async def evaluate(params, tickets, pool):
+    """
+    Prize groups won and winning numbers matched by each ticket over every past draw
+    """
+    data = await get_data(params)
+
+    loop = asyncio.get_running_loop()
+    if len(tickets) * len(data) > OFFLOAD_CELLS:
+        return await loop.run_in_executor(pool, evaluate_response, data.file, tickets)
+
+    # Small evaluations run inline, unless the data has to be (re)loaded first
+    if dataset.is_loaded(data.file):
+        return evaluate_response(data.file, tickets)
+    return await loop.run_in_executor(None, evaluate_response, data.file, tickets)
+
+
+
+async def backtest(params, body, pool):
+    """
+    Evaluate many tickets, always in the worker pool
+    """
+    if body:
+        try:
+            tickets = json.loads(body)["tickets"]
+        except (ValueError, KeyError, TypeError):
+            raise ServiceError('Body must be JSON like {"tickets": [[1, 2, 3, 4, 5, 6]]}')
+    else:
+        tickets = [ticket for ticket in params.get("tickets", "").split(";") if ticket]
+
+    if not tickets or len(tickets) > MAX_TICKETS:
+        raise ServiceError(f"Give 1 to {MAX_TICKETS} tickets")
+    tickets = [parse_ticket(ticket) for ticket in tickets]
+
+    data = await get_data(params)
+    return await asyncio.get_running_loop().run_in_executor(pool, evaluate_response, data.file, tickets)
+
+
+
+async def health(params):
+    return {"status": "ok", "sources": [name for name, file in SOURCES.items() if os.path.exists(file)]}
+
+
+
+# Endpoints answered from memory in the event loop, their responses are cached
+CACHED_ENDPOINTS = {
+    "/health": health,
+    "/frequency": frequency,
+    "/ci": confidence_intervals,
+}
+
+
+
+def to_json(value):
+    """
+    json.dumps default for numpy values in pandas records
+    """
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+
+def encode(payload):
+    return json.dumps(payload, default=to_json, separators=(",", ":")).encode()
+
+
+
+async def dispatch(method, target, body, pool):
+    """
+    Route one request, returns (status, encoded JSON body)
+    """
+    url = urlsplit(target)
+    params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+
+    try:
+        if url.path in CACHED_ENDPOINTS:
+            if method != "GET":
+                return 405, encode({"error": "Use GET"})
+
+            # Fingerprint of the source file, a changed file never hits an old response
+            file = SOURCES.get(params.get("source", "results"), "")
+            key = (url.path, tuple(sorted(params.items())), dataset.file_fingerprint(file) if os.path.exists(file) else None)
+            if key not in _responses:
+                if len(_responses) >= CACHE_SIZE:
+                    _responses.pop(next(iter(_responses)))
+                _responses[key] = encode(await CACHED_ENDPOINTS[url.path](params))
+            return 200, _responses[key]
+
+        if url.path == "/evaluate" and method == "GET":
+            return 200, await evaluate(params, [parse_ticket(params.get("ticket", ""))], pool)
+
+        if url.path == "/backtest" and method in ("GET", "POST"):
+            return 200, await backtest(params, body, pool)
+
+        return 404, encode({"error": f"No endpoint {method} {url.path}"})
+
+    except ServiceError as e:
+        return 400, encode({"error": str(e)})
+    except Exception as e:
+        print(f"❌ Error handling {method} {target}: {e}")
+        return 500, encode({"error": "Internal error"})
+
+
+
+async def handle_connection(reader, writer, pool):
+    """
+    Serve HTTP/1.1 requests on one (keep-alive) connection
+    """
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            method, target, version = request_line.decode("latin-1").split()
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            length = int(headers.get("content-length") or 0)
+
+            start = time.perf_counter()
+            if length > MAX_BODY:
+                # The body is never read, so the connection cannot be reused
+                status, payload = 413, encode({"error": f"Request body over {MAX_BODY} bytes"})
+                headers["connection"] = "close"
+            else:
+                body = await reader.readexactly(length)
+                status, payload = await dispatch(method, target, body, pool)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+            writer.write(
+                f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                f"Server-Timing: app;dur={elapsed_ms:.3f}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + payload
+            )
+            await writer.drain()
+
+            if not keep_alive:
+                break
+
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+
+async def serve(host=HOST, port=PORT, workers=None):
+    """
+    Load the data, then serve until interrupted
+    """
+    # Warm up: pay for the scipy import and load every available source and its tables once
+    import confidence_intervals
+    for source, file in SOURCES.items():
+        if os.path.exists(file):
+            data = load_dataset(file)
+            if data is not None:
+                data.position_counts
+                data.frequency_cube
+                print(f"✅ Loaded {len(data)} {source} draws")
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        server = await asyncio.start_server(lambda reader, writer: handle_connection(reader, writer, pool), host, port)
+        print(f"🚀 Analytics service on http://{host}:{port}")
+
+        async with server:
+            await server.serve_forever()
+
+
+
+def main():
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else PORT
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+
+    try:
+        asyncio.run(serve(port=port, workers=workers))
+    except KeyboardInterrupt:
+        print("\n👋 Analytics service stopped")
+
+
+
+if __name__ == "__main__":
+    main()
@@ -7,38 +7,57 @@ This script can be run manually or scheduled to automatically update TOTO data
 import os
 import sys
 import time
-from datetime import datetime
-import pandas as pd
-
-# Import our modules
-try:
-    from scraper_final import scrape_toto_results_final
-    from clean_data import load_data, clean_data
-    from summary_analysis import analyze_and_compare
-    SCRAPER_AVAILABLE = True
-except ImportError as e:
-    print(f"Error importing modules: {e}")
+import json
+import hashlib
+import importlib.util
+from datetime import datetime, timedelta
+from draw_calendar import latest_draw_date, last_draw_due, next_draw_due, now_sgt
+
+# Our modules pull in pandas, matplotlib and requests, so they are imported
+# inside the functions that need them. A full run where every stage is cached
+# then never pays for those imports
+REQUIRED_PACKAGES = ["requests", "bs4", "pandas", "matplotlib", "numpy"]
+MISSING_PACKAGES = [name for name in REQUIRED_PACKAGES if importlib.util.find_spec(name) is None]
+SCRAPER_AVAILABLE = not MISSING_PACKAGES
+
+if not SCRAPER_AVAILABLE:
+    print(f"Error importing modules: missing {', '.join(MISSING_PACKAGES)}")
     print("Make sure all required packages are installed:")
     print("pip install requests beautifulsoup4 pandas matplotlib numpy scipy seaborn")
-    SCRAPER_AVAILABLE = False
+
+# Fingerprints of the inputs each pipeline stage last ran successfully with
+PIPELINE_CACHE = ".pipeline_cache.json"
+
+# Resident scheduler: structured (one JSON object per line) log, how long to
+# wait before retrying when a due draw is not published yet, and the longest
+# single sleep so clock changes / suspends are picked up
+DAEMON_LOG = "toto_daemon.log"
+DAEMON_LOCK = ".toto_daemon.lock"
+RETRY_INTERVAL = timedelta(minutes=30)
+MAX_SLEEP = timedelta(hours=1)
 
 def check_data_freshness():
     """
-    Check if the current data is fresh (less than 7 days old)
+    Check if the current data already contains the latest scheduled draw
+
+    Compares the latest draw date stored in the data against the draw calendar
+    (Mondays and Thursdays), so the website is only scraped when a draw is due
     """
     if not os.path.exists("toto_results.csv"):
         return False, "No data file found"
     
     try:
-        # Get file modification time
-        mtime = os.path.getmtime("toto_results.csv")
-        last_modified = datetime.fromtimestamp(mtime)
-        days_old = (datetime.now() - last_modified).days
+        latest = latest_draw_date("toto_results.csv")
+        if latest is None:
+            return False, "No draw dates found in data"
+        
+        due = last_draw_due()
         
-        if days_old > 7:
-            return False, f"Data is {days_old} days old"
+        if due is not None and latest < due:
+            return False, f"Latest draw in data is {latest}, draw of {due} is due"
         else:
-            return True, f"Data is {days_old} days old"
+            next_due = next_draw_due()
+            return True, f"Latest draw in data is {latest}, next results due {next_due.strftime('%Y-%m-%d %H:%M')} SGT"
     except Exception as e:
         return False, f"Error checking file: {e}"
 
@@ -65,33 +84,82 @@ def update_data():
     print("🔄 Updating TOTO data...")
     
     try:
-        # Backup existing data if it exists
+        import pandas as pd
+        from scraper_final import scrape_toto_results_final
+        from snapshot_store import record_snapshot
+        
+        # Make sure the current data is in the snapshot store before it gets overwritten
         if os.path.exists("toto_results.csv"):
-            backup_name = f"toto_results_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-            os.rename("toto_results.csv", backup_name)
-            print(f"📦 Backed up existing data to {backup_name}")
+            _, entry = record_snapshot(pd.read_csv("toto_results.csv", dtype={"Date": str}))
+            if entry is not None:
+                print(f"📦 Recorded {entry['new_draws']} existing draws in snapshot {entry['hash'][:12]}")
         
-        # Download fresh data
+        # Download fresh data (only overwrites toto_results.csv on success)
         results = scrape_toto_results_final()
         
         if results is not None:
-            print(f"✅ Successfully updated data: {len(results)} draws")
+            # Store only the new draws and write back the full history
+            merged, entry = record_snapshot(results)
+            merged.to_csv("toto_results.csv", index=False)
+            
+            # Add the new draws to the saved draws-since / gap index and pair counts,
+            # the cleaned dataset loaded here is shared with the later stages of the run
+            from dataset import get_dataset
+            from gap_index import load_gap_index
+            from co_occurrence import load_co_occurrence
+            data = get_dataset("toto_results.csv", prompt=False)
+            if data is not None:
+                load_gap_index(data.dates, data.history, data.file)
+                load_co_occurrence(data.dates, data.history, data.file)
+            
+            if entry is not None:
+                print(f"📦 Snapshot {entry['hash'][:12]}: {entry['new_draws']} new draws")
+            else:
+                print("📦 No new draws since last snapshot")
+            
+            print(f"✅ Successfully updated data: {len(merged)} draws")
             return True
         else:
             print("❌ Failed to update data")
-            # Restore backup if available
-            if os.path.exists(backup_name):
-                os.rename(backup_name, "toto_results.csv")
-                print("🔄 Restored previous data")
             return False
             
     except Exception as e:
         print(f"❌ Error during update: {e}")
         return False
 
-def run_analysis():
+def render_charts():
+    """
+    Render every chart for the real and simulated data to images/ without a display
+    """
+    if not os.path.exists("toto_results.csv"):
+        print("❌ No data file found. Run update first.")
+        return False
+    
+    try:
+        from render_charts import render_all
+        return render_all()
+    
+    except Exception as e:
+        print(f"❌ Error rendering charts: {e}")
+        return False
+
+def export_stats():
+    """
+    Write the precomputed statistics the web app serves (public/toto_stats.json)
+    """
+    try:
+        from stats_artifact import write_stats
+        return write_stats()
+    
+    except Exception as e:
+        print(f"❌ Error exporting stats: {e}")
+        return False
+
+def run_analysis(data=None):
     """
     Run comprehensive analysis on current data
+
+    data is the shared dataset for toto_results.csv, loaded once per process if not given
     """
     print("\n" + "=" * 60)
     print("Running Analysis".center(60))
@@ -102,21 +170,24 @@ def run_analysis():
         return False
     
     try:
-        # Load and clean data
-        results, cols = load_data("toto_results.csv")
-        if results is None:
+        from dataset import get_dataset
+        from summary_analysis import analyze_and_compare
+        
+        # Load and clean data (reuses the already loaded dataset if the file is unchanged)
+        if data is None:
+            data = get_dataset("toto_results.csv", prompt=False)
+        if data is None:
             print("❌ Failed to load data")
             return False
         
-        clean_results = clean_data(results)
-        if clean_results is None:
-            print("❌ Failed to clean data")
+        if not os.path.exists("simulated_draws.csv"):
+            print("❌ No simulated data to compare with. Run monte_carlo.py first.")
             return False
         
-        print(f"✅ Loaded {len(clean_results)} draws for analysis")
+        print(f"✅ Loaded {len(data)} draws for analysis")
         
         # Run summary analysis
-        analysis_results = analyze_and_compare()
+        analysis_results = analyze_and_compare(real=data, show=False)
         
         if analysis_results:
             print("✅ Analysis completed successfully")
@@ -129,41 +200,54 @@ def run_analysis():
         print(f"❌ Error during analysis: {e}")
         return False
 
-def generate_report():
+def generate_report(data=None):
     """
     Generate a simple text report
+
+    data is the shared dataset for toto_results.csv, loaded once per process if not given
     """
     if not os.path.exists("toto_results.csv"):
         return False
     
     try:
-        results, cols = load_data("toto_results.csv")
-        clean_results = clean_data(results)
+        import numpy as np
+        from dataset import get_dataset
+        
+        if data is None:
+            data = get_dataset("toto_results.csv", prompt=False)
+        if data is None:
+            return False
         
         # Create report
         report = []
         report.append("TOTO ANALYSIS REPORT")
         report.append("=" * 50)
         report.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        report.append(f"Data draws: {len(clean_results)}")
+        report.append(f"Data draws: {len(data)}")
         report.append("")
         
-        # Frequency analysis
-        all_numbers = []
-        for col in clean_results.columns:
-            all_numbers.extend(clean_results[col].tolist())
-        
-        from collections import Counter
-        freq = Counter(all_numbers)
+        # Frequency analysis (numbers 1-49, highest count first, ties by number)
+        freq = data.frequencies[1:]
+        by_count = np.argsort(-freq, kind="stable")
         
         report.append("MOST FREQUENT NUMBERS:")
-        for num, count in freq.most_common(10):
-            report.append(f"  {num}: {count} times")
+        for i in by_count[:10]:
+            report.append(f"  {i + 1}: {freq[i]} times")
         
         report.append("")
         report.append("LEAST FREQUENT NUMBERS:")
-        for num, count in sorted(freq.items())[:10]:
-            report.append(f"  {num}: {count} times")
+        for i in np.argsort(freq, kind="stable")[:10]:
+            report.append(f"  {i + 1}: {freq[i]} times")
+        
+        # Overdue numbers from the saved gap index (only new draws are added to it)
+        from gap_index import load_gap_index
+        overdue = load_gap_index(data.dates, data.history, data.file).overdue_table()
+        
+        report.append("")
+        report.append("MOST OVERDUE NUMBERS:")
+        for row in overdue.head(10).itertuples():
+            average = f"{row.mean_gap:.1f}" if row.appearances > 1 else "-"
+            report.append(f"  {row.number}: {row.draws_since} draws since last seen (average gap {average})")
         
         # Save report
         report_text = "\n".join(report)
@@ -177,6 +261,254 @@ def generate_report():
         print(f"❌ Error generating report: {e}")
         return False
 
+def file_fingerprint(path, known=None):
+    """
+    Content hash of a file, None if it does not exist
+
+    known is the entry saved for this file on the last run, its hash is
+    reused if size and modification time are unchanged so big inputs like
+    simulated_draws.csv are not re-read on every run
+    """
+    if not os.path.exists(path):
+        return None
+    
+    stat = os.stat(path)
+    if known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+        return known
+    
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest.hexdigest()}
+
+def code_files(module, found=None):
+    """
+    Source file of a module of this repo and of every repo module it imports
+    (at any depth, including imports inside functions)
+    """
+    import ast
+    
+    found = set() if found is None else found
+    path = f"{module}.py"
+    if path in found or not os.path.exists(path):
+        return found
+    
+    found.add(path)
+    with open(path, "rb") as f:
+        tree = ast.parse(f.read())
+    
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                code_files(alias.name.split(".")[0], found)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            code_files(node.module.split(".")[0], found)
+    
+    return found
+
+def stage_fingerprint(stage, files):
+    """
+    Fingerprint of everything a stage reads and of the code it runs, files
+    holds the per file hashes. A change to the stage's modules (or to this
+    script) invalidates the cached stage like a changed input does
+    """
+    digest = hashlib.sha256(stage["name"].encode())
+    
+    code = set()
+    for module in stage["code"]:
+        code_files(module, code)
+    
+    for path in stage["inputs"] + ["auto_update.py"] + sorted(code):
+        files[path] = file_fingerprint(path, files.get(path))
+        digest.update(path.encode())
+        digest.update((files[path]["sha256"] if files[path] else "missing").encode())
+    
+    return digest.hexdigest()
+
+def load_pipeline_cache():
+    """
+    Load fingerprints saved by the last pipeline run
+    """
+    try:
+        with open(PIPELINE_CACHE, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"files": {}, "stages": {}}
+
+def save_pipeline_cache(cache):
+    """
+    Save fingerprints for the next pipeline run
+    """
+    tmp_path = PIPELINE_CACHE + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp_path, PIPELINE_CACHE)
+
+# Stages of the full pipeline with the files they read and write, the modules
+# they run and the stages they need (a stage is not run if one of those failed)
+# update always runs, it decides itself (from the draw calendar) whether to scrape
+PIPELINE = [
+    {"name": "update", "run": update_data, "inputs": [], "outputs": ["toto_results.csv"],
+     "code": ["scraper_final", "snapshot_store", "draw_calendar", "dataset", "gap_index", "co_occurrence"], "after": [], "cache": False},
+    {"name": "analysis", "run": run_analysis, "inputs": ["toto_results.csv", "simulated_draws.csv"],
+     "outputs": ["images/comparison_analysis.png"], "code": ["summary_analysis"], "after": ["update"], "cache": True},
+    {"name": "charts", "run": render_charts, "inputs": ["toto_results.csv", "simulated_draws.csv"],
+     "outputs": ["images/Overall_Freq.png", "images/S_Overall_Freq.png"], "code": ["render_charts"],
+     "after": ["update"], "cache": True},
+    {"name": "stats", "run": export_stats, "inputs": ["toto_results.csv"],
+     "outputs": [os.path.join("public", "toto_stats.json")], "code": ["stats_artifact"], "after": ["update"], "cache": True},
+    {"name": "report", "run": generate_report, "inputs": ["toto_results.csv"],
+     "outputs": ["toto_report.txt"], "code": ["dataset", "gap_index"], "after": ["update"], "cache": True},
+]
+
+def run_pipeline(stages=PIPELINE, force=False):
+    """
+    Run pipeline stages in order, skipping stages whose inputs and code did
+    not change since they last succeeded and whose outputs still exist
+
+    A failed stage only stops the stages that need it, the others still run
+    """
+    cache = load_pipeline_cache()
+    files = cache.setdefault("files", {})
+    fingerprints = cache.setdefault("stages", {})
+    failed = set()
+    
+    for stage in stages:
+        name = stage["name"]
+        
+        blocked = [after for after in stage["after"] if after in failed]
+        if blocked:
+            print(f"⛔ {name}: not run, {', '.join(blocked)} failed")
+            failed.add(name)
+            continue
+        
+        if stage["cache"] and not force:
+            outputs_exist = all(os.path.exists(path) for path in stage["outputs"])
+            if outputs_exist and fingerprints.get(name) == stage_fingerprint(stage, files):
+                print(f"⏭️  {name}: inputs unchanged, skipped")
+                continue
+        
+        start = time.time()
+        if not stage["run"]():
+            print(f"❌ {name} failed")
+            fingerprints.pop(name, None)
+            failed.add(name)
+            continue
+        
+        # Inputs are fingerprinted after the run, so a stage that rewrites its
+        # own input (update) is not seen as changed on the next run
+        fingerprints[name] = stage_fingerprint(stage, files)
+        print(f"✅ {name} finished in {time.time() - start:.2f}s")
+    
+    save_pipeline_cache(cache)
+    return not failed
+
+def log_event(event, **fields):
+    """
+    Append one structured log record to the daemon log
+    """
+    record = {"time": datetime.now().isoformat(timespec="seconds"), "event": event, **fields}
+    with open(DAEMON_LOG, "a") as f:
+        f.write(json.dumps(record) + "\n")
+
+def sleep_until(wake_at):
+    """
+    Sleep until wake_at (Singapore time) in steps of at most MAX_SLEEP
+    """
+    while True:
+        remaining = (wake_at - now_sgt()).total_seconds()
+        if remaining <= 0:
+            return
+        time.sleep(min(remaining, MAX_SLEEP.total_seconds()))
+
+def acquire_daemon_lock():
+    """
+    Take the exclusive daemon lock, returns the open lock file (keep it open
+    while running) or None if another daemon already holds it
+
+    The lock is released by the OS when the process exits, even if it is killed
+    """
+    lock = open(DAEMON_LOCK, "a+")
+    
+    try:
+        if os.name == "nt":
+            import msvcrt
+            lock.seek(0)
+            msvcrt.locking(lock.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        return None
+    
+    # Pid of the running daemon, for whoever wants to stop it
+    lock.seek(0)
+    lock.truncate()
+    lock.write(str(os.getpid()))
+    lock.flush()
+    return lock
+
+def run_daemon():
+    """
+    Resident scheduler replacing a cron job per update
+
+    Imports and the loaded dataset stay warm in this process. It wakes when
+    the results of the next draw are due, runs the pipeline in-process and
+    retries every RETRY_INTERVAL until the due draw shows up in the data.
+    Only one daemon runs per project folder, a second one exits right away
+    """
+    lock = acquire_daemon_lock()
+    if lock is None:
+        print(f"⚠️  Another scheduler is already running (see {DAEMON_LOCK}), exiting")
+        log_event("daemon_stop", reason="already running", pid=os.getpid())
+        return True
+    
+    log_event("daemon_start", pid=os.getpid())
+    
+    if not SCRAPER_AVAILABLE:
+        log_event("daemon_stop", reason=f"missing packages: {', '.join(MISSING_PACKAGES)}")
+        return False
+    
+    # Warm up: pay for the heavy imports and the first load once
+    start = time.time()
+    import matplotlib
+    matplotlib.use("Agg")  # no display, charts are only saved
+    import scraper_final
+    import summary_analysis
+    from dataset import get_dataset
+    if os.path.exists("toto_results.csv"):
+        get_dataset("toto_results.csv", prompt=False)
+    log_event("warm_up", duration_ms=round((time.time() - start) * 1000, 1))
+    
+    try:
+        while True:
+            start = time.time()
+            try:
+                success = run_pipeline()
+            except Exception as e:
+                success = False
+                log_event("run_error", error=str(e))
+            
+            is_fresh, status = check_data_freshness()
+            log_event("run", success=success, fresh=is_fresh, status=status,
+                      duration_ms=round((time.time() - start) * 1000, 1))
+            
+            # Wait for the next draw, or retry soon if the due draw is still missing
+            if is_fresh:
+                wake_at = next_draw_due()
+            else:
+                wake_at = now_sgt() + RETRY_INTERVAL
+            
+            log_event("sleep", until=wake_at.isoformat(timespec="seconds"))
+            sleep_until(wake_at)
+    
+    except KeyboardInterrupt:
+        log_event("daemon_stop", reason="interrupted")
+        return True
+
 def main():
     """
     Main function for automated updates
@@ -200,19 +532,27 @@ def main():
             success = generate_report()
             sys.exit(0 if success else 1)
         
+        elif command == "render":
+            success = render_charts()
+            sys.exit(0 if success else 1)
+        
+        elif command == "stats":
+            success = export_stats()
+            sys.exit(0 if success else 1)
+        
         elif command == "full":
             print("🔄 Running full update and analysis...")
-            update_success = update_data()
-            if update_success:
-                analysis_success = run_analysis()
-                report_success = generate_report()
-                sys.exit(0 if all([update_success, analysis_success, report_success]) else 1)
-            else:
-                sys.exit(1)
+            success = run_pipeline(force="--force" in sys.argv[2:])
+            sys.exit(0 if success else 1)
+        
+        elif command == "daemon":
+            print(f"⏰ Running resident scheduler, logging to {DAEMON_LOG}")
+            success = run_daemon()
+            sys.exit(0 if success else 1)
         
         else:
             print(f"❌ Unknown command: {command}")
-            print("Available commands: update, analyze, report, full")
+            print("Available commands: update, analyze, report, render, stats, full [--force], daemon")
             sys.exit(1)
     
     # Interactive mode
@@ -233,10 +573,7 @@ def main():
         generate_report()
     elif choice == "4":
         print("🔄 Running full update and analysis...")
-        update_success = update_data()
-        if update_success:
-            run_analysis()
-            generate_report()
+        run_pipeline()
     elif choice == "0":
         print("Goodbye!")
     else:
@@ -1,6 +1,12 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
+
+
+# TOTO prize group for [winning numbers matched, additional number matched], 0 = no prize
+PRIZE_GROUPS = np.array([[0, 0], [0, 0], [0, 0], [7, 6], [5, 4], [3, 2], [1, 1]], dtype=np.int64)
+
+# Ticket x draw cells evaluated at once, bounds memory for big simulated sets
+BLOCK_CELLS = 4_000_000
 
 
 def backtest(results):
@@ -48,8 +54,163 @@ def backtest(results):
     
 
 
+def to_bitmasks(numbers):
+    """
+    Each row of numbers (1-49) as a bitmask, bit n is set if n is in the row
+    """
+    numbers = np.asarray(numbers, dtype=np.uint64)
+    return np.bitwise_or.reduce(np.left_shift(np.uint64(1), numbers), axis=-1)
+
+
+
+def popcount(masks):
+    """
+    Number of set bits of each bitmask
+    """
+    masks = np.asarray(masks, dtype=np.uint64)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(masks).astype(np.int64)
+
+    # numpy < 2: count bits in parallel within the word (SWAR)
+    masks = masks - ((masks >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    masks = (masks & np.uint64(0x3333333333333333)) + ((masks >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    masks = (masks + (masks >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return ((masks * np.uint64(0x0101010101010101)) >> np.uint64(56)).astype(np.int64)
+
+
+
+def evaluate_tickets(numbers, tickets):
+    """
+    Prize groups and match counts of tickets against every draw, vectorized over tickets and draws
+
+    numbers is an (N, 7) array of draws (Num7 is the additional number) and
+    tickets a (T, 6) array. Returns prizes (T, 8) with how many draws each
+    ticket would have won in each prize group (column 0 = no prize) and
+    matches (T, 7) with how many draws it matched 0-6 winning numbers
+    """
+    numbers = np.asarray(numbers)
+    draws = to_bitmasks(numbers[:, :6])
+    additional = np.left_shift(np.uint64(1), numbers[:, 6].astype(np.uint64))
+    tickets = to_bitmasks(tickets).reshape(-1)
+
+    prizes = np.zeros((len(tickets), 8), dtype=np.int64)
+    matches = np.zeros((len(tickets), 7), dtype=np.int64)
+    block = max(1, BLOCK_CELLS // max(len(draws), 1))
+
+    for start in range(0, len(tickets), block):
+        ticket_block = tickets[start:start + block, None]
+        hits = popcount(ticket_block & draws)
+        groups = PRIZE_GROUPS[hits, ((ticket_block & additional) != 0).astype(np.int64)]
+
+        # One bincount per table, each ticket offset into its own row
+        rows = np.arange(len(ticket_block))[:, None]
+        prizes[start:start + block] = np.bincount((rows * 8 + groups).ravel(), minlength=len(ticket_block) * 8).reshape(-1, 8)
+        matches[start:start + block] = np.bincount((rows * 7 + hits).ravel(), minlength=len(ticket_block) * 7).reshape(-1, 7)
+
+    return prizes, matches
+
+
+
+def nearest_draws(numbers, tickets, k=10, metric="overlap", include_additional=False, masks=None):
+    """
+    The k past draws most similar to each ticket, and how many draws share 0-6 numbers with it
+
+    numbers is an (N, 7) array of draws and tickets a (T, 6) array, masks
+    optionally the draws already as bitmasks (to_bitmasks of the numbers
+    compared, e.g. TotoDataset.bitmasks) so they are not built again. Similarity
+    is the overlap count or the Jaccard index (shared / distinct numbers) of the
+    ticket and the winning numbers (all 7 with include_additional). Both rank
+    draws the same way since every draw has the same size, ties go to the
+    later draw (the most recent one for draws in date order). Returns indexes (T, k) most similar first, their
+    similarity (T, k) and the overlap histogram (T, 7)
+    """
+    numbers = np.asarray(numbers)
+    if masks is not None:
+        draws = np.asarray(masks, dtype=np.uint64)
+    else:
+        draws = to_bitmasks(numbers if include_additional else numbers[:, :6])
+    draw_size = 7 if include_additional else 6
+    tickets = to_bitmasks(tickets).reshape(-1)
+    ticket_size = popcount(tickets)
+    k = min(k, len(draws))
+
+    indexes = np.zeros((len(tickets), k), dtype=np.int64)
+    overlaps = np.zeros((len(tickets), k), dtype=np.int64)
+    histogram = np.zeros((len(tickets), 7), dtype=np.int64)
+    block = max(1, BLOCK_CELLS // max(len(draws), 1))
+
+    # Overlap first, then the later draw, as one integer key per (ticket, draw)
+    tie_break = np.arange(len(draws))
+
+    for start in range(0, len(tickets), block):
+        overlap = popcount(tickets[start:start + block, None] & draws)
+        rows = np.arange(len(overlap))[:, None]
+        histogram[start:start + block] = np.bincount((rows * 7 + np.minimum(overlap, 6)).ravel(),
+                                                     minlength=len(overlap) * 7).reshape(-1, 7)
+
+        if k:
+            # Top k of each row in O(N), then only those k are sorted
+            key = overlap * len(draws) + tie_break
+            top = np.argpartition(-key, k - 1, axis=1)[:, :k]
+            top = np.take_along_axis(top, np.argsort(-np.take_along_axis(key, top, axis=1), axis=1), axis=1)
+            indexes[start:start + block] = top
+            overlaps[start:start + block] = np.take_along_axis(overlap, top, axis=1)
+
+    if metric == "overlap":
+        similarity = overlaps
+    elif metric == "jaccard":
+        similarity = overlaps / (ticket_size[:, None] + draw_size - overlaps)
+    else:
+        raise ValueError(f"Unknown similarity metric: {metric}")
+
+    return indexes, similarity, histogram
+
+
+
+def similar_draws(workspace, k=10):
+    """
+    Show the past draws closest to a ticket entered by the user (workspace is a dataset.TotoDataset)
+    """
+    ticket = getNum()
+
+    # Date ordered draws (with their dates for past results) and their bitmasks, kept on the workspace
+    numbers, masks = workspace.history, workspace.bitmasks
+    indexes, jaccard, histogram = nearest_draws(numbers, [ticket], k, metric="jaccard", masks=masks)
+    shared = popcount(to_bitmasks(ticket) & masks[indexes[0]])
+
+    print(f"\nDraws closest to {sorted(ticket)}:")
+    for draw, count, score in zip(indexes[0], shared, jaccard[0]):
+        date = workspace.dates[draw] if workspace.dates is not None else f"Draw {draw}"
+        print(f"  {date}: {numbers[draw, :6].tolist()} + {numbers[draw, 6]}  shared {count}, Jaccard {score:.2f}")
+
+    print("\nDraws sharing n numbers with the ticket:")
+    for count, draws in enumerate(histogram[0]):
+        print(f"  {count}: {draws}")
+
+
+
+def backtest_query(tickets, file="toto_results.csv", **filters):
+    """
+    Evaluate tickets on only the draws matching a query of the inverted index,
+    e.g. backtest_query(tickets, all_of=[7], start_date="2020-01-01")
+
+    Returns prizes and matches as evaluate_tickets does, and the number of draws tested
+    """
+    import dataset
+
+    index = dataset.get_dataset(file).inverted_index
+    draws = index.numbers[index.draw_indexes(index.query(**filters))]
+    prizes, matches = evaluate_tickets(draws, tickets)
+
+    return prizes, matches, len(draws)
+
+
+
 def backtest_with_position_ranges(results, position_ranges):
 
+    # Plotting only needed here
+    import matplotlib.pyplot as plt
+
     # Keep only Num1–Num6
     expected_cols = ['Num1', 'Num2', 'Num3', 'Num4', 'Num5', 'Num6']
 
@@ -0,0 +1,62 @@
+# Importing relevant libraries
+import hashlib
+import json
+import numpy as np
+
+
+
+# Bump when the look of the charts changes, so every saved chart is redrawn once
+CHART_VERSION = "1"
+
+# PNG text chunk the fingerprint of a saved chart is stored in
+FINGERPRINT_KEY = "toto-fingerprint"
+
+
+
+def chart_fingerprint(*inputs, **params):
+    """
+    sha256 over the arrays a chart is drawn from and its plot parameters
+
+    inputs are count arrays (or anything numpy can turn into one), params
+    the rest of what changes the picture, e.g. chart name, column, dpi
+    """
+    digest = hashlib.sha256(CHART_VERSION.encode())
+
+    for value in inputs:
+        array = np.ascontiguousarray(value)
+        digest.update(f"{array.dtype}{array.shape}".encode())
+        digest.update(array.tobytes())
+
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+
+def saved_fingerprint(path):
+    """
+    Fingerprint stored in a saved PNG chart, None if missing or not saved with one
+    """
+    # Pillow comes with matplotlib, opening only reads the PNG header chunks
+    from PIL import Image
+
+    try:
+        with Image.open(path) as image:
+            return getattr(image, "text", {}).get(FINGERPRINT_KEY)
+    except (OSError, ValueError):
+        return None
+
+
+
+def is_current(path, fingerprint):
+    """
+    True if path was rendered from the same inputs, so it does not need to be drawn again
+    """
+    return saved_fingerprint(path) == fingerprint
+
+
+
+def save_metadata(fingerprint):
+    """
+    metadata argument for plt.savefig storing the fingerprint in the PNG
+    """
+    return {FINGERPRINT_KEY: fingerprint} if fingerprint else None
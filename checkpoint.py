@@ -0,0 +1,111 @@
+# Importing relevant libraries
+import json
+import os
+import time
+
+
+
+# Folder where progress of long running jobs (scrapes, simulations) is saved
+CHECKPOINT_DIR = ".checkpoints"
+
+
+
+def checkpoint_path(name):
+    """
+    Get the path of the checkpoint file for a job
+    """
+    return os.path.join(CHECKPOINT_DIR, f"{name}.json")
+
+
+
+def load_checkpoint(name):
+    """
+    Load saved progress for a job, returns None if there is nothing to resume
+    """
+    path = checkpoint_path(name)
+
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+
+    # A corrupt checkpoint is treated as no checkpoint (start from scratch)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Ignoring unreadable checkpoint {path}: {e}")
+        return None
+
+
+
+def save_checkpoint(name, state):
+    """
+    Save progress for a job
+
+    Written to a temp file first and then renamed so that an interrupt
+    while saving never leaves a half written checkpoint behind
+    """
+    os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+    path = checkpoint_path(name)
+    tmp_path = path + ".tmp"
+
+    with open(tmp_path, "w") as f:
+        json.dump(state, f)
+
+    os.replace(tmp_path, path)
+
+
+
+def clear_checkpoint(name):
+    """
+    Remove the checkpoint of a job once it has finished
+    """
+    path = checkpoint_path(name)
+
+    if os.path.exists(path):
+        os.remove(path)
+
+
+
+class Progress:
+    """
+    Prints progress and estimated time remaining for a job with a known total
+    """
+
+    def __init__(self, total, label="Progress", start=0):
+        self.total = total
+        self.label = label
+
+        # Work already done before this run (resumed from checkpoint) is not
+        # counted towards the rate, otherwise the ETA would be far too optimistic
+        self.start = start
+        self.start_time = time.time()
+
+    def update(self, done):
+        elapsed = time.time() - self.start_time
+        done_this_run = done - self.start
+
+        if done_this_run > 0 and done < self.total:
+            remaining = (self.total - done) * elapsed / done_this_run
+            eta = format_duration(remaining)
+        elif done >= self.total:
+            eta = "done"
+        else:
+            eta = "--:--"
+
+        pct = done / self.total * 100 if self.total else 100.0
+        print(f"{self.label}: {done}/{self.total} ({pct:5.1f}%) | elapsed {format_duration(elapsed)} | ETA {eta}")
+
+
+
+def format_duration(seconds):
+    """
+    Format seconds as mm:ss (or h:mm:ss for long jobs)
+    """
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes:02d}:{secs:02d}"
@@ -4,7 +4,8 @@ import pandas as pd
 
 
 # Load data from csv file and catch errors if there are any
-def load_data(file):
+# With with_dates the Date column of past results is returned as well (None for simulated data)
+def load_data(file, with_dates=False):
 
     print("=" * 60)
     print("Loading data".center(60))
@@ -14,38 +15,42 @@ def load_data(file):
         # Open file containing past toto results
         df = pd.read_csv(file)
 
-        # Rename columns if using past data
+        # Rename columns if using past data (recognised by its columns, whatever the file is called)
         column_names = ['Num1', 'Num2', 'Num3', 'Num4', 'Num5', 'Num6', 'Num7']
+        results_columns = ['Winning Number 1', '2', '3', '4', '5', '6', 'Additional Number']
+        dates = None
 
-        if (file == "toto_results.csv"):
-            results_columns = ['Winning Number 1', '2', '3', '4', '5', '6', 'Additional Number']
+        if results_columns[0] in df.columns:
             results = df[results_columns]
             results.columns = column_names
+            if with_dates:
+                dates = df.get('Date')
         else:
             results = df[column_names]
 
         print("Data loaded sucessfully from: ", file, "\n")
-        return results, column_names
+        return (results, column_names, dates) if with_dates else (results, column_names)
     
     # Handles FileNotFoundError when file is not found
     except FileNotFoundError:
         print("Error! CSV file not found!")
         print("Download CSV file from 'https://en.lottolyzer.com/history/singapore/toto' or generate Monte Carlo simulated data!")
-        return None, None
+        return (None, None, None) if with_dates else (None, None)
     
     # Handles KeyError when there is a missing column
     except KeyError as e:
         print(f"Error! Missing column: {e}")
-        return None, None
+        return (None, None, None) if with_dates else (None, None)
     
     # Handles any other exceptions and prints it out
     except Exception as e:
         print(f"UnknownError! {e}")
-        return None, None
+        return (None, None, None) if with_dates else (None, None)
     
 
 
-def clean_data(results):
+# Without prompt (services, scheduled runs) rows with errors are skipped without asking
+def clean_data(results, prompt=True):
     print("=" * 60)
     print("Cleaning data".center(60))
     print("-" * 60, "\n")
@@ -98,6 +103,10 @@ def clean_data(results):
         print("Dataset is clean! Ready for analysis!\n")
         return clean_results
     
+    if not prompt:
+        print("Errors found in dataset! Skipping rows with errors\n")
+        return clean_results
+
     while True:
         choice = input("Errors found in dataset! \n" \
         "1. Skip rows with errors \n" \
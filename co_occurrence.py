@@ -0,0 +1,157 @@
+# Importing relevant libraries
+import os
+import numpy as np
+import pandas as pd
+
+
+
+# Draws turned into one-hot rows per matrix product, bounds memory on big simulated sets
+BLOCK_SIZE = 100000
+
+
+
+def one_hot(numbers):
+    """
+    (N, 50) matrix with a 1 in column n if number n is in the draw, column 0 is unused
+    """
+    numbers = np.asarray(numbers)
+    matrix = np.zeros((len(numbers), 50), dtype=np.float32)
+    matrix[np.arange(len(numbers))[:, None], numbers] = 1
+
+    return matrix
+
+
+
+class CoOccurrence:
+    """
+    How often pairs and triplets of winning numbers (Num1 - Num6) were drawn together
+
+    pairs[a, b] is the number of draws containing both a and b and
+    triplets[a, b, c] the number containing a, b and c (indexes are the
+    numbers, 0 is unused, the diagonal of pairs holds single number counts).
+    The triplet tensor is only 50 x 50 x 50 so it is kept dense.
+    latest_date is the date of the last draw added (past results only)
+    """
+
+    def __init__(self, draws=0, pairs=None, triplets=None, latest_date=""):
+        self.draws = draws
+        self.pairs = pairs if pairs is not None else np.zeros((50, 50), dtype=np.int64)
+        self.triplets = triplets if triplets is not None else np.zeros((50, 50, 50), dtype=np.int64)
+        self.latest_date = latest_date
+
+    @classmethod
+    def from_numbers(cls, numbers):
+        """
+        Build from an (N, 6) or (N, 7) array of draws
+        """
+        co_occurrence = cls()
+        co_occurrence.update(numbers)
+        return co_occurrence
+
+    def update(self, numbers, latest_date=""):
+        """
+        Add new draws to the counts, only the new draws are processed
+        """
+        numbers = np.asarray(numbers)[:, :6]
+        if numbers.size and (numbers.min() < 1 or numbers.max() > 49):
+            raise ValueError("Draw numbers must be from 1 to 49")
+
+        for start in range(0, len(numbers), BLOCK_SIZE):
+            block = one_hot(numbers[start:start + BLOCK_SIZE])
+
+            # X.T @ X counts every pair in one matrix product
+            self.pairs += (block.T @ block).astype(np.int64)
+
+            # Triplets containing a: pair counts among the draws containing a
+            for a in range(1, 50):
+                rows = block[block[:, a] == 1]
+                if len(rows):
+                    self.triplets[a] += (rows.T @ rows).astype(np.int64)
+
+        self.draws += len(numbers)
+        self.latest_date = latest_date or self.latest_date
+
+    def expected_pair(self):
+        """
+        Expected draws containing a given pair for a fair draw
+        """
+        return self.draws * (6 * 5) / (49 * 48)
+
+    def expected_triplet(self):
+        """
+        Expected draws containing a given triplet for a fair draw
+        """
+        return self.draws * (6 * 5 * 4) / (49 * 48 * 47)
+
+    def pair_table(self, top=20):
+        """
+        Pairs sorted by how much more often they appear than chance predicts
+        """
+        a, b = np.triu_indices(50, k=1)
+        keep = a > 0
+        a, b = a[keep], b[keep]
+
+        return self._table({'a': a, 'b': b}, self.pairs[a, b], self.expected_pair(), top)
+
+    def triplet_table(self, top=20):
+        """
+        Triplets sorted by how much more often they appear than chance predicts
+        """
+        a, b, c = np.nonzero(self.triplets)
+        keep = (a < b) & (b < c)
+        a, b, c = a[keep], b[keep], c[keep]
+
+        return self._table({'a': a, 'b': b, 'c': c}, self.triplets[a, b, c], self.expected_triplet(), top)
+
+    def _table(self, columns, counts, expected, top):
+        table = pd.DataFrame(columns)
+        table['count'] = counts
+        table['expected'] = expected
+        table['ratio'] = counts / expected if expected else np.nan
+
+        return table.sort_values(['count', 'a'], ascending=[False, True], kind="stable").head(top).reset_index(drop=True)
+
+    def save(self, path):
+        np.savez(path, draws=self.draws, pairs=self.pairs, triplets=self.triplets, latest_date=self.latest_date)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(int(data['draws']), data['pairs'], data['triplets'], str(data['latest_date']))
+
+
+
+def co_occurrence_path(file):
+    """
+    Co-occurrence counts are stored next to the history file, e.g. toto_results_pairs.npz
+    """
+    return os.path.splitext(file)[0] + "_pairs.npz"
+
+
+
+def load_co_occurrence(dates, numbers, file="toto_results.csv"):
+    """
+    Load the saved co-occurrence counts of a results file and add the draws newer than them
+
+    dates and numbers are the cleaned draws in date order (oldest first), as
+    kept on the shared dataset. The counts are rebuilt if they are missing or
+    the data is missing older draws they were built from. Saved again after
+    """
+    path = co_occurrence_path(file)
+    co_occurrence = CoOccurrence.load(path) if os.path.exists(path) else None
+
+    # Counts must cover exactly the draws up to their latest date, otherwise start again
+    known = 0
+    if co_occurrence is not None:
+        known = int(np.searchsorted(dates, co_occurrence.latest_date, side="right"))
+        if known != co_occurrence.draws:
+            co_occurrence, known = None, 0
+
+    if co_occurrence is None:
+        co_occurrence = CoOccurrence()
+
+    if known < len(numbers):
+        co_occurrence.update(numbers[known:], dates[-1])
+        co_occurrence.save(path)
+
+    return co_occurrence
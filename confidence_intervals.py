@@ -0,0 +1,109 @@
+# Importing relevant libraries
+import numpy as np
+import pandas as pd
+from scipy.stats import beta, norm
+import order_statistics
+
+
+
+COLUMN_NAMES = ['Num1', 'Num2', 'Num3', 'Num4', 'Num5', 'Num6', 'Num7']
+
+# Many intervals are read at once (7 x 49 in the table), so they are corrected by default
+DEFAULT_CORRECTION = "bonferroni"
+
+
+
+def interval_bounds(counts, trials, method="wilson", alpha=0.05):
+    """
+    Lower and upper bounds of the proportion counts / trials, element-wise over arrays
+
+    method: "wilson" (score interval), "exact" (Clopper-Pearson) or "wald"
+    (normal approximation, what the chart used to print)
+    """
+    counts = np.asarray(counts, dtype=float)
+    trials = np.broadcast_to(np.asarray(trials, dtype=float), counts.shape)
+    n = np.maximum(trials, 1)
+    p = counts / n
+
+    if method == "wilson":
+        z = norm.ppf(1 - alpha / 2)
+        denominator = 1 + z ** 2 / n
+        center = (p + z ** 2 / (2 * n)) / denominator
+        half_width = z * np.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / denominator
+        lower, upper = center - half_width, center + half_width
+
+    elif method == "exact":
+        # Beta quantiles are undefined at the edges, where the bound is 0 or 1
+        with np.errstate(invalid="ignore"):
+            lower = np.where(counts > 0, beta.ppf(alpha / 2, counts, trials - counts + 1), 0.0)
+            upper = np.where(counts < trials, beta.ppf(1 - alpha / 2, counts + 1, trials - counts), 1.0)
+
+    elif method == "wald":
+        z = norm.ppf(1 - alpha / 2)
+        se = np.sqrt(p * (1 - p) / n)
+        lower, upper = p - z * se, p + z * se
+
+    else:
+        raise ValueError(f"Unknown interval method: {method}")
+
+    return np.clip(lower, 0, 1), np.clip(upper, 0, 1)
+
+
+
+def corrected_alpha(alpha, intervals, correction=DEFAULT_CORRECTION):
+    """
+    Per interval alpha so that all intervals together hold with 1 - alpha
+
+    correction: "bonferroni", "sidak" or None / "none" (each interval on its own)
+    """
+    if correction == "bonferroni":
+        return alpha / intervals
+    if correction == "sidak":
+        return 1 - (1 - alpha) ** (1 / intervals)
+    if correction in (None, "none"):
+        return alpha
+
+    raise ValueError(f"Unknown correction: {correction}")
+
+
+
+def correction_label(correction=DEFAULT_CORRECTION):
+    """
+    Short label of a correction for titles and printouts, e.g. "Bonferroni" or "uncorrected"
+    """
+    return "uncorrected" if correction in (None, "none") else correction.capitalize()
+
+
+
+def confidence_interval_table(position_counts, method="wilson", confidence=0.95, correction=DEFAULT_CORRECTION):
+    """
+    Confidence intervals for the proportion of every number in every column, in one call
+
+    position_counts is a (columns, 50) count matrix (column 0 unused), e.g.
+    dataset.TotoDataset.position_counts. correction adjusts for reading all
+    columns x 49 intervals at once (see corrected_alpha). Returns a tidy
+    DataFrame with one row per (column, number) including the expected
+    proportion for a fair draw and whether it lies outside the interval
+    """
+    counts = np.asarray(position_counts)[:, 1:]
+    columns = len(counts)
+    trials = counts.sum(axis=1, keepdims=True)
+    tests = counts.shape[1]
+    alpha = corrected_alpha(1 - confidence, counts.size, correction)
+
+    lower, upper = interval_bounds(counts, trials, method, alpha)
+    expected = order_statistics.POSITION_PROBABILITIES[:columns, 1:]
+    residuals = order_statistics.position_residuals(counts, trials.max(), range(columns))
+
+    return pd.DataFrame({
+        'column': np.repeat(COLUMN_NAMES[:columns], tests),
+        'number': np.tile(np.arange(1, tests + 1), columns),
+        'count': counts.ravel(),
+        'draws': np.repeat(trials.ravel(), tests),
+        'proportion': (counts / np.maximum(trials, 1)).ravel(),
+        'ci_lower': lower.ravel(),
+        'ci_upper': upper.ravel(),
+        'expected': expected.ravel(),
+        'residual': residuals.ravel(),
+        'outside': ((expected < lower) | (expected > upper)).ravel(),
+    })
@@ -0,0 +1,182 @@
+# Importing relevant libraries
+import os
+from functools import cached_property
+import numpy as np
+import clean_data
+from frequency_cube import FrequencyCube
+
+
+
+class TotoDataset:
+    """
+    Draw results that have been loaded, cleaned and converted to arrays once
+
+    results: clean DataFrame with columns Num1 - Num7
+    numbers: (N, 7) int array of the same draws
+    dates, history: draw dates and numbers of the same draws in date order
+    (oldest first), dates is None for simulated draws which keep their order
+
+    Derived tables are computed the first time they are used and then kept
+    for as long as the dataset is (until the file changes)
+    """
+
+    def __init__(self, file, results, column_names, fingerprint, dates=None):
+        self.file = file
+        self.results = results
+        self.column_names = column_names
+        self.fingerprint = fingerprint
+
+        self.numbers = results[column_names].to_numpy(dtype=np.int64)
+
+        # Past results are listed newest first, equal dates keep their file order
+        if dates is None:
+            self.dates = None
+            self.history = self.numbers
+        else:
+            dates = np.asarray(dates).astype(str)
+            order = np.argsort(dates, kind="stable")
+            self.dates = dates[order]
+            self.history = self.numbers[order]
+
+    def __len__(self):
+        return len(self.results)
+
+    @cached_property
+    def position_counts(self):
+        """
+        (7, 50) counts of each number per column, row i is Num{i+1}, column 0 is unused
+        """
+        return count_matrix(self.numbers)
+
+    @cached_property
+    def frequencies(self):
+        """
+        How many times each number appears in Num1 - Num7, indexed 0-49 (0 is unused)
+        """
+        return self.position_counts.sum(axis=0)
+
+    @cached_property
+    def frequency_cube(self):
+        """
+        Prefix-sum counts over the draws in date order (oldest first) for window queries
+        """
+        return FrequencyCube(self.history, self.dates)
+
+    @cached_property
+    def inverted_index(self):
+        """
+        Packed bitset of the draws containing each number, for boolean draw queries
+        """
+        from inverted_index import InvertedIndex
+
+        return InvertedIndex(self.history, self.dates)
+
+    @cached_property
+    def co_occurrence(self):
+        """
+        Pair and triplet counts of the winning numbers
+
+        For past results the saved counts are loaded and only new draws are
+        added (co_occurrence.load_co_occurrence), simulated draws are counted here
+        """
+        from co_occurrence import CoOccurrence, load_co_occurrence
+
+        if self.dates is not None:
+            return load_co_occurrence(self.dates, self.history, self.file)
+
+        return CoOccurrence.from_numbers(self.history)
+
+    @cached_property
+    def bitmasks(self):
+        """
+        Winning numbers (Num1 - Num6) of each draw in date order (history) as a
+        uint64 bitmask, bit n is set if n was drawn (backtest.to_bitmasks)
+        """
+        from backtest import to_bitmasks
+
+        return to_bitmasks(self.history[:, :6])
+
+    @cached_property
+    def sums(self):
+        """
+        Sum of the winning numbers (Num1 - Num6) of each draw in date order (history)
+        """
+        return self.history[:, :6].sum(axis=1)
+
+
+
+def count_matrix(numbers):
+    """
+    (columns, 50) counts of each number per column of an (N, columns) array, in a single pass
+    """
+    numbers = np.asarray(numbers, dtype=np.int64)
+
+    # Offset each column into its own block of 50 so one bincount counts all columns
+    offsets = numbers + 50 * np.arange(numbers.shape[1])
+    return np.bincount(offsets.ravel(), minlength=50 * numbers.shape[1]).reshape(-1, 50)
+
+
+
+# Datasets loaded in this process, by file name
+_datasets = {}
+
+
+
+def file_fingerprint(file):
+    """
+    Size and modification time of a file, changes whenever the file is rewritten
+    """
+    stat = os.stat(file)
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+
+def is_loaded(file):
+    """
+    True if file is loaded in this process and has not changed since
+    """
+    cached = _datasets.get(file)
+    return cached is not None and os.path.exists(file) and cached.fingerprint == file_fingerprint(file)
+
+
+
+def get_dataset(file="toto_results.csv", clean=None, prompt=True):
+    """
+    Load a dataset once per process and share it between callers
+
+    The dataset is reloaded only if the file changed since it was loaded.
+    Past results (a results CSV with dates, under any file name) are cleaned
+    (from 3rd party), simulated data is not unless clean is given. Without prompt rows with errors are skipped instead of
+    asking what to do. Returns None if the file could not be loaded or cleaned
+    """
+    if not os.path.exists(file):
+        print(f"Error! {file} not found!")
+        return None
+
+    fingerprint = file_fingerprint(file)
+    cached = _datasets.get(file)
+
+    if cached is not None and cached.fingerprint == fingerprint:
+        return cached
+
+    results, column_names, dates = clean_data.load_data(file, with_dates=True)
+    if results is None or column_names is None:
+        return None
+
+    if clean is None:
+        clean = dates is not None
+
+    if clean:
+        results = clean_data.clean_data(results, prompt)
+        if results is None:
+            return None
+
+    # Dates of the rows that are left, a draw without a date cannot be put in date order
+    if dates is not None:
+        dates = dates.loc[results.index]
+        results, dates = results[dates.notna()], dates[dates.notna()]
+
+    dataset = TotoDataset(file, results, column_names, fingerprint, dates)
+    _datasets[file] = dataset
+
+    return dataset
@@ -0,0 +1,76 @@
+# Importing relevant libraries
+import csv
+from datetime import date, datetime, time, timedelta, timezone
+
+
+
+# TOTO is drawn every Monday and Thursday at 6.30pm Singapore time
+DRAW_WEEKDAYS = (0, 3)
+DRAW_TIME = time(18, 30)
+SGT = timezone(timedelta(hours=8))
+
+# Results usually appear on the website within an hour or two of the draw
+RESULTS_DELAY = timedelta(hours=2)
+
+
+
+def now_sgt():
+    """
+    Current time in Singapore
+    """
+    return datetime.now(SGT)
+
+
+
+def last_draw_due(now=None):
+    """
+    Date of the most recent scheduled draw whose results should be published by now
+    """
+    now = now or now_sgt()
+    cutoff = now - RESULTS_DELAY
+
+    # Walk back at most a week to find the latest draw day
+    for days_back in range(8):
+        day = cutoff.date() - timedelta(days=days_back)
+        if day.weekday() in DRAW_WEEKDAYS and datetime.combine(day, DRAW_TIME, SGT) <= cutoff:
+            return day
+
+    return None
+
+
+
+def next_draw_due(now=None):
+    """
+    Time at which the results of the next scheduled draw should be available
+    """
+    now = now or now_sgt()
+
+    for days_ahead in range(8):
+        day = now.date() + timedelta(days=days_ahead)
+        due = datetime.combine(day, DRAW_TIME, SGT) + RESULTS_DELAY
+        if day.weekday() in DRAW_WEEKDAYS and due > now:
+            return due
+
+    return None
+
+
+
+def latest_draw_date(file="toto_results.csv"):
+    """
+    Latest draw date stored in a results CSV, None if it has no dates
+
+    Only the Date column is parsed so this stays cheap on every check
+    """
+    latest = None
+
+    with open(file, newline="") as f:
+        for row in csv.DictReader(f):
+            try:
+                day = date.fromisoformat(row["Date"].strip())
+            except (KeyError, AttributeError, ValueError):
+                continue
+
+            if latest is None or day > latest:
+                latest = day
+
+    return latest
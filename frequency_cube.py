@@ -0,0 +1,115 @@
+# Importing relevant libraries
+import numpy as np
+import pandas as pd
+
+
+
+# Prefix sums take (N + 1) * 7 * 50 counts. Above this size (e.g. 10M simulated
+# draws) only every stride-th prefix is kept and the rest of a window is counted directly
+MAX_BYTES = 128 * 1024 * 1024
+
+
+
+class FrequencyCube:
+    """
+    Cumulative counts of every number per column over the draws in date order
+
+    prefix[i, c, n] is how many times number n appeared in column c in
+    draws [0, i * stride), so the counts for any window of draws [a, b) are
+    a subtraction of two prefixes (plus a short direct count if stride > 1)
+    """
+
+    def __init__(self, numbers, dates=None, stride=None):
+        self.numbers = np.asarray(numbers, dtype=np.int64)
+        self.dates = None if dates is None else np.asarray(dates).astype(str)
+        self.draws, self.columns = self.numbers.shape
+
+        # Each column is a block of 50 counts, a number outside 1-49 would land in the next block
+        if self.numbers.size and (self.numbers.min() < 1 or self.numbers.max() > 49):
+            raise ValueError("Draw numbers must be from 1 to 49")
+
+        row_bytes = self.columns * 50 * 4
+        self.stride = stride or max(1, -(-(self.draws + 1) * row_bytes // MAX_BYTES))
+
+        # One-hot counts per draw (offset each column into its own block of 50),
+        # summed per stride and then accumulated
+        flat = self.numbers + 50 * np.arange(self.columns)
+        blocks = np.arange(self.draws) // self.stride
+        num_blocks = -(-self.draws // self.stride)
+        cells = (blocks + 1)[:, None] * (self.columns * 50) + flat
+        counts = np.bincount(cells.ravel(), minlength=(num_blocks + 1) * self.columns * 50)
+        counts = counts.reshape(num_blocks + 1, self.columns * 50)
+
+        self.prefix = np.cumsum(counts, axis=0, dtype=np.int32).reshape(-1, self.columns, 50)
+
+    def _prefix(self, i):
+        """
+        (columns, 50) counts over draws [0, i)
+        """
+        block, rest = divmod(i, self.stride)
+        counts = self.prefix[block].astype(np.int64)
+
+        if rest:
+            start = block * self.stride
+            flat = self.numbers[start:i] + 50 * np.arange(self.columns)
+            counts = counts + np.bincount(flat.ravel(), minlength=self.columns * 50).reshape(self.columns, 50)
+
+        return counts
+
+    def window(self, start=0, end=None):
+        """
+        (columns, 50) counts of each number per column over draws [start, end)
+
+        Negative indexes count from the latest draw, e.g. window(-100) is the last 100 draws
+        """
+        start, end, _ = slice(start, end).indices(self.draws)
+        return self._prefix(max(end, start)) - self._prefix(start)
+
+    def overall(self, start=0, end=None):
+        """
+        (50,) counts of each number over all columns for draws [start, end)
+        """
+        return self.window(start, end).sum(axis=0)
+
+    def date_window(self, start_date=None, end_date=None, include_end=False):
+        """
+        (columns, 50) counts for draws dated from start_date up to (not including) end_date,
+        or up to and including end_date with include_end
+
+        Dates are ISO strings, e.g. date_window("2023-01-01", "2024-01-01") is calendar year 2023
+        """
+        if self.dates is None:
+            raise ValueError("Dataset has no draw dates")
+
+        start = 0 if start_date is None else int(np.searchsorted(self.dates, start_date, side="left"))
+        side = "right" if include_end else "left"
+        end = self.draws if end_date is None else int(np.searchsorted(self.dates, end_date, side=side))
+
+        return self.window(start, end)
+
+    def rolling(self, size):
+        """
+        (draws - size + 1, 50) overall counts of each rolling window of size draws
+        """
+        if self.stride != 1:
+            # Strided prefixes miss most window ends, so count overall per draw
+            # (one 50 wide row each, no bigger than the result) and accumulate
+            draws = np.repeat(np.arange(1, self.draws + 1), self.columns)
+            counts = np.bincount(draws * 50 + self.numbers.ravel(), minlength=(self.draws + 1) * 50)
+            totals = np.cumsum(counts.reshape(-1, 50), axis=0, dtype=np.int32)
+        else:
+            totals = self.prefix.sum(axis=1)
+
+        return totals[size:] - totals[:-size]
+
+    def by_year(self):
+        """
+        Overall counts per calendar year, one row per year and one column per number 1-49
+        """
+        if self.dates is None:
+            raise ValueError("Dataset has no draw dates")
+
+        years = sorted({date[:4] for date in self.dates})
+        rows = [self.date_window(f"{year}-01-01", f"{int(year) + 1}-01-01").sum(axis=0)[1:] for year in years]
+
+        return pd.DataFrame(rows, index=years, columns=range(1, 50))
@@ -0,0 +1,155 @@
+# Importing relevant libraries
+import os
+import numpy as np
+import pandas as pd
+
+
+
+RESULTS_COLUMNS = ['Winning Number 1', '2', '3', '4', '5', '6', 'Additional Number']
+
+
+
+class GapIndex:
+    """
+    Draws since each number (1-49) last appeared and the distribution of its gaps
+
+    Draws are counted in date order starting from 0, a number counts as
+    appearing if it is one of the 7 numbers (winning + additional).
+    last_seen[n] is the index of the last draw containing n (-1 if never),
+    histograms[n, g] how many times n came back after a gap of g draws
+    (g = 1 means it appeared in two draws in a row). Index 0 is unused
+    """
+
+    def __init__(self, draws=0, last_seen=None, histograms=None, latest_date=""):
+        self.draws = draws
+        self.last_seen = last_seen if last_seen is not None else np.full(50, -1, dtype=np.int64)
+        self.histograms = histograms if histograms is not None else np.zeros((50, 1), dtype=np.int64)
+        self.latest_date = latest_date
+
+    @classmethod
+    def build(cls, numbers, latest_date=""):
+        """
+        Build the index from an (N, 7) array of draws in date order, in one vectorized pass
+        """
+        numbers = np.asarray(numbers, dtype=np.int64)
+        draws = len(numbers)
+
+        if numbers.size and (numbers.min() < 1 or numbers.max() > 49):
+            raise ValueError("Draw numbers must be from 1 to 49")
+
+        # Every (number, draw index) appearance, sorted by number then draw
+        draw_index = np.repeat(np.arange(draws), numbers.shape[1])
+        number = numbers.ravel()
+        order = np.lexsort((draw_index, number))
+        number, draw_index = number[order], draw_index[order]
+
+        # Gaps between consecutive appearances of the same number
+        same = number[1:] == number[:-1]
+        gap_numbers = number[1:][same]
+        gaps = (draw_index[1:] - draw_index[:-1])[same]
+
+        width = int(gaps.max()) + 1 if len(gaps) else 1
+        histograms = np.bincount(gap_numbers * width + gaps, minlength=50 * width).reshape(50, width)
+
+        # Appearances are sorted by draw so the last write per number is its last appearance
+        last_seen = np.full(50, -1, dtype=np.int64)
+        last_seen[number] = draw_index
+
+        return cls(draws, last_seen, histograms, latest_date)
+
+    def update(self, draw, date=""):
+        """
+        Add one new draw (the 7 numbers), only touches the numbers in the draw
+        """
+        if not all(1 <= n <= 49 for n in draw):
+            raise ValueError(f"Draw numbers must be from 1 to 49, got {list(draw)}")
+
+        for n in draw:
+            if self.last_seen[n] >= 0:
+                gap = self.draws - self.last_seen[n]
+
+                # Grow the histograms for a gap longer than any seen before
+                if gap >= self.histograms.shape[1]:
+                    self.histograms = np.pad(self.histograms, ((0, 0), (0, gap + 1 - self.histograms.shape[1])))
+
+                self.histograms[n, gap] += 1
+            self.last_seen[n] = self.draws
+
+        self.draws += 1
+        self.latest_date = date or self.latest_date
+
+    def draws_since(self):
+        """
+        Draws since each number last appeared (0 = in the latest draw), indexed 0-49
+        """
+        return np.where(self.last_seen >= 0, self.draws - 1 - self.last_seen, self.draws)
+
+    def overdue_table(self):
+        """
+        One row per number with draws since it last appeared and its gap statistics
+        """
+        gaps = np.arange(self.histograms.shape[1])
+        counts = self.histograms[1:]
+        returns = counts.sum(axis=1)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean_gap = np.where(returns > 0, (counts * gaps).sum(axis=1) / returns, np.nan)
+
+        max_gap = np.where(counts > 0, gaps, 0).max(axis=1)
+
+        table = pd.DataFrame({
+            'number': np.arange(1, 50),
+            'draws_since': self.draws_since()[1:],
+            'appearances': returns + (self.last_seen[1:] >= 0),
+            'mean_gap': mean_gap,
+            'max_gap': max_gap,
+        })
+
+        return table.sort_values('draws_since', ascending=False, kind="stable").reset_index(drop=True)
+
+    def save(self, path):
+        np.savez(path, draws=self.draws, last_seen=self.last_seen, histograms=self.histograms,
+                 latest_date=self.latest_date)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(int(data['draws']), data['last_seen'], data['histograms'], str(data['latest_date']))
+
+
+
+def gap_index_path(file):
+    """
+    Gap index is stored next to the history file, e.g. toto_results_gaps.npz
+    """
+    return os.path.splitext(file)[0] + "_gaps.npz"
+
+
+
+def load_gap_index(dates, numbers, file="toto_results.csv"):
+    """
+    Load the saved gap index of a results file and bring it up to date
+
+    dates and numbers are the cleaned draws in date order (oldest first), as
+    kept on the shared dataset (dataset.get_dataset(file).dates / .history).
+    Only draws newer than the saved index are added (a few operations each).
+    The index is rebuilt if it is missing or the data is missing older draws
+    it was built from. The updated index is saved again
+    """
+    path = gap_index_path(file)
+    index = GapIndex.load(path) if os.path.exists(path) else None
+
+    # Index must cover exactly the draws up to its latest date, otherwise start again
+    if index is not None:
+        known = int(np.searchsorted(dates, index.latest_date, side="right"))
+        if known != index.draws:
+            index = None
+
+    if index is None:
+        index = GapIndex.build(numbers, dates[-1] if len(dates) else "")
+    else:
+        for date, draw in zip(dates[known:], numbers[known:]):
+            index.update(draw, date)
+
+    index.save(path)
+    return index
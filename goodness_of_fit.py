@@ -0,0 +1,146 @@
+# Importing relevant libraries
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2, kstwo
+from order_statistics import NUMBERS, POSITION_PROBABILITIES
+
+
+
+COLUMN_NAMES = ['Num1', 'Num2', 'Num3', 'Num4', 'Num5', 'Num6', 'Num7']
+
+
+
+def chi_square_test(observed, expected):
+    """
+    Pearson chi-square statistic and p-value over the last axis
+
+    observed and expected are count arrays that broadcast together, so many
+    positions / datasets are tested in one call. Cells with expected count 0
+    are left out (and not counted in the degrees of freedom)
+    """
+    observed = np.asarray(observed, dtype=float)
+    expected = np.broadcast_to(np.asarray(expected, dtype=float), observed.shape)
+    used = expected > 0
+
+    terms = np.where(used, (observed - expected) ** 2 / np.where(used, expected, 1), 0)
+    statistic = terms.sum(axis=-1)
+    dof = used.sum(axis=-1) - 1
+
+    return statistic, dof, chi2.sf(statistic, dof)
+
+
+
+def g_test(observed, expected):
+    """
+    G-test (log-likelihood ratio) statistic and p-value over the last axis, same inputs as chi_square_test
+    """
+    observed = np.asarray(observed, dtype=float)
+    expected = np.broadcast_to(np.asarray(expected, dtype=float), observed.shape)
+    used = expected > 0
+
+    # 0 * log(0) is taken as 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terms = np.where(used & (observed > 0), observed * np.log(observed / expected), 0)
+
+    statistic = 2 * terms.sum(axis=-1)
+    dof = used.sum(axis=-1) - 1
+
+    return statistic, dof, chi2.sf(statistic, dof)
+
+
+
+def ks_test(observed, probabilities):
+    """
+    Kolmogorov-Smirnov statistic and p-value over the last axis
+
+    Compares the empirical CDF of the observed counts with the CDF of the
+    given probabilities. The p-value uses the continuous KS distribution,
+    which is conservative for a discrete distribution like this one
+    """
+    observed = np.asarray(observed, dtype=float)
+    n = observed.sum(axis=-1)
+
+    empirical_cdf = np.cumsum(observed, axis=-1) / np.maximum(n, 1)[..., None]
+    expected_cdf = np.cumsum(probabilities, axis=-1)
+    statistic = np.abs(empirical_cdf - expected_cdf).max(axis=-1)
+
+    return statistic, kstwo.sf(statistic, np.maximum(n, 1).astype(int))
+
+
+
+def scaled_test(test, observed, expected, scale):
+    """
+    Run a chi-square type test with its statistic multiplied by scale
+    """
+    statistic, dof, _ = test(observed, expected)
+    statistic = statistic * scale
+
+    return statistic, dof, chi2.sf(statistic, dof)
+
+
+
+def goodness_of_fit(position_counts):
+    """
+    Test every column (Num1 - Num7) and all numbers together against a fair draw
+
+    position_counts is a (7, 50) count matrix (dataset.TotoDataset.position_counts).
+    Returns a DataFrame with one row per column plus an 'Overall' row.
+    With only a few hundred draws many expected counts are below 5, so the
+    chi-square and G-test p-values are approximate
+    """
+    counts = np.asarray(position_counts)[:, 1:]
+    probabilities = POSITION_PROBABILITIES[:, 1:]
+    draws = counts.sum(axis=1)
+
+    # Per column: each column has its own expected distribution
+    expected = probabilities * draws[:, None]
+    chi_stat, chi_dof, chi_p = chi_square_test(counts, expected)
+    g_stat, g_dof, g_p = g_test(counts, expected)
+    ks_stat, ks_p = ks_test(counts, probabilities)
+
+    # Overall: each number appears in 7 of 49 slots per draw. The 7 numbers of
+    # a draw are all different, so counts vary less than multinomial counts
+    # would and the statistics are scaled up by 49 / (49 - 7) to follow chi2(48)
+    overall = counts.sum(axis=0)
+    picked = len(counts)
+    overall_expected = np.full(NUMBERS, draws.max() * picked / NUMBERS)
+    scale = NUMBERS / (NUMBERS - picked)
+    all_chi = scaled_test(chi_square_test, overall, overall_expected, scale)
+    all_g = scaled_test(g_test, overall, overall_expected, scale)
+
+    table = pd.DataFrame({
+        'position': COLUMN_NAMES[:len(counts)],
+        'draws': draws,
+        'chi2': chi_stat,
+        'dof': chi_dof,
+        'chi2_p': chi_p,
+        'g': g_stat,
+        'g_p': g_p,
+        'ks_d': ks_stat,
+        'ks_p': ks_p,
+    })
+
+    overall_row = pd.DataFrame([{
+        'position': 'Overall',
+        'draws': draws.max(),
+        'chi2': all_chi[0],
+        'dof': all_chi[1],
+        'chi2_p': all_chi[2],
+        'g': all_g[0],
+        'g_p': all_g[2],
+        'ks_d': np.nan,
+        'ks_p': np.nan,
+    }])
+
+    return pd.concat([table, overall_row], ignore_index=True)
+
+
+
+def compare_datasets(datasets):
+    """
+    Goodness of fit tables for several datasets in one tidy table
+
+    datasets maps a name to a (7, 50) count matrix
+    """
+    tables = [goodness_of_fit(counts).assign(dataset=name) for name, counts in datasets.items()]
+    return pd.concat(tables, ignore_index=True)
@@ -0,0 +1,137 @@
+# Importing relevant libraries
+import numpy as np
+import pandas as pd
+from backtest import popcount
+
+
+
+COLUMN_NAMES = ['Num1', 'Num2', 'Num3', 'Num4', 'Num5', 'Num6', 'Num7']
+
+
+
+def pack(bits):
+    """
+    Bool array(s) over the draws packed into uint64 words, bit i of the bitset is draw i
+    """
+    bits = np.atleast_2d(bits)
+    padding = -bits.shape[1] % 64
+    bits = np.pad(bits, ((0, 0), (0, padding)))
+
+    return np.packbits(bits, axis=1, bitorder="little").view(np.uint64)
+
+
+
+class InvertedIndex:
+    """
+    For every number a packed bitset (posting list) of the draws containing it
+
+    Draws are in date order (oldest first). Bit i of winning[n] is set if n
+    is one of the winning numbers (Num1 - Num6) of draw i, additional[n] the
+    same for the additional number. A boolean query is a handful of AND / OR
+    operations over N / 64 words per number instead of a scan of every row
+    """
+
+    def __init__(self, numbers, dates=None):
+        self.numbers = np.asarray(numbers, dtype=np.int64)
+        self.dates = None if dates is None else np.asarray(dates).astype(str)
+        self.draws = len(self.numbers)
+
+        if self.numbers.size and (self.numbers.min() < 1 or self.numbers.max() > 49):
+            raise ValueError("Draw numbers must be from 1 to 49")
+
+        self.winning = self._bitsets(self.numbers[:, :6])
+        self.additional = self._bitsets(self.numbers[:, 6:7])
+        self.drawn = self.winning | self.additional
+
+    def _bitsets(self, columns):
+        """
+        (50, words) bitsets, row n marks the draws with n in any of the columns
+        """
+        member = np.zeros((50, self.draws), dtype=bool)
+        member[columns, np.arange(self.draws)[:, None]] = True
+        return pack(member)
+
+    def date_mask(self, start_date=None, end_date=None):
+        """
+        Bitset of the draws dated from start_date up to (not including) end_date, all draws if not given
+        """
+        start, end = 0, self.draws
+        if start_date is not None or end_date is not None:
+            if self.dates is None:
+                raise ValueError("Dataset has no draw dates")
+            if start_date is not None:
+                start = int(np.searchsorted(self.dates, start_date, side="left"))
+            if end_date is not None:
+                end = int(np.searchsorted(self.dates, end_date, side="left"))
+
+        bits = np.zeros(self.draws, dtype=bool)
+        bits[start:end] = True
+        return pack(bits)[0]
+
+    def query(self, all_of=(), any_of=(), none_of=(), additional=None, start_date=None, end_date=None,
+              include_additional=False):
+        """
+        Bitset of the draws containing every number of all_of, at least one of
+        any_of and none of none_of, optionally with the additional number being
+        (one of) additional and within a date range
+
+        Numbers are matched against the winning numbers, or against all 7 drawn
+        numbers with include_additional
+        """
+        bitsets = self.drawn if include_additional else self.winning
+        mask = self.date_mask(start_date, end_date)
+
+        for number in all_of:
+            mask &= bitsets[number]
+        if len(any_of):
+            mask &= np.bitwise_or.reduce(bitsets[list(any_of)], axis=0)
+        if len(none_of):
+            mask &= ~np.bitwise_or.reduce(bitsets[list(none_of)], axis=0)
+        if additional is not None:
+            mask &= np.bitwise_or.reduce(self.additional[np.atleast_1d(additional)], axis=0)
+
+        return mask
+
+    def count(self, mask):
+        """
+        Number of draws in a bitset
+        """
+        return int(popcount(mask).sum())
+
+    def draw_indexes(self, mask):
+        """
+        Indexes of the draws in a bitset, oldest first
+        """
+        return np.flatnonzero(np.unpackbits(mask.view(np.uint8), bitorder="little")[:self.draws])
+
+    def table(self, mask):
+        """
+        The draws in a bitset as a DataFrame (Date, Num1 - Num7), newest first
+        """
+        rows = self.draw_indexes(mask)[::-1]
+        table = pd.DataFrame(self.numbers[rows], columns=COLUMN_NAMES)
+
+        if self.dates is not None:
+            table.insert(0, 'Date', self.dates[rows])
+
+        return table
+
+
+
+def query_draws(file="toto_results.csv", **filters):
+    """
+    Draws of a results file matching a query, newest first, e.g. all draws
+    containing 7 and 23 but not 41 since 2020:
+
+        query_draws(all_of=[7, 23], none_of=[41], start_date="2020-01-01")
+
+    Uses the index kept on the shared dataset, built the first time it is queried
+    """
+    import dataset
+
+    data = dataset.get_dataset(file)
+    if data is None:
+        return None
+
+    index = data.inverted_index
+    return index.table(index.query(**filters))
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Local load test for the web app's /api/toto-data route
+Sends GET requests from several keep-alive connections for a fixed time and
+reports requests/second, latency and bytes per response for a plain
+request, a compressed one and a conditional one (If-None-Match)
+
+Start the app first (npm run dev / npm start), then:
+Usage: python load_test.py [url] [seconds] [connections]
+"""
+
+import http.client
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+DEFAULT_URL = "http://localhost:3000/api/toto-data"
+
+# Request headers of each scenario, the conditional one gets the ETag of the first response
+SCENARIOS = {
+    "plain": {},
+    "compressed": {"Accept-Encoding": "br, gzip"},
+    "conditional": {"Accept-Encoding": "br, gzip", "If-None-Match": None},
+}
+
+
+
+def fetch(url, headers):
+    """
+    One request, returns (status, headers, body)
+    """
+    parts = urlsplit(url)
+    target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=10)
+    try:
+        connection.request("GET", target, headers=headers)
+        response = connection.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        connection.close()
+
+
+
+def worker(url, headers, stop_at, results):
+    """
+    Send requests back to back on one keep-alive connection until stop_at
+    """
+    parts = urlsplit(url)
+    target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=10)
+    latencies = []
+    sizes = 0
+    errors = 0
+
+    while time.perf_counter() < stop_at:
+        start = time.perf_counter()
+        try:
+            connection.request("GET", target, headers=headers)
+            response = connection.getresponse()
+            sizes += len(response.read())
+            if response.status not in (200, 304):
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            connection.close()
+            connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=10)
+            continue
+        latencies.append(time.perf_counter() - start)
+
+    connection.close()
+    results.append((latencies, sizes, errors))
+
+
+
+def run_scenario(url, headers, seconds, connections):
+    """
+    Load one scenario, returns requests/second, p50 and p99 latency (ms), mean bytes and errors
+    """
+    results = []
+    stop_at = time.perf_counter() + seconds
+    threads = [threading.Thread(target=worker, args=(url, headers, stop_at, results)) for _ in range(connections)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencies = sorted(latency for result in results for latency in result[0])
+    sizes = sum(result[1] for result in results)
+    errors = sum(result[2] for result in results)
+
+    if not latencies:
+        return 0.0, 0.0, 0.0, 0, errors
+
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    return len(latencies) / seconds, p50, p99, sizes // len(latencies), errors
+
+
+
+def main():
+    url = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_URL
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+    connections = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+
+    print("=" * 60)
+    print("Load Test".center(60))
+    print("-" * 60)
+    print(f"{url}, {seconds:g}s per scenario, {connections} connections\n")
+
+    try:
+        status, headers, body = fetch(url, {})
+    except OSError as e:
+        print(f"❌ Could not reach {url}: {e}")
+        sys.exit(1)
+
+    etag = headers.get("ETag") or headers.get("etag")
+    print(f"First response: {status}, {len(body) / 1024:.1f} KB, ETag {etag or '(none)'}\n")
+
+    print(f"{'Scenario':<12} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'bytes':>9} {'errors':>7}")
+    for name, scenario in SCENARIOS.items():
+        headers = dict(scenario)
+        if "If-None-Match" in headers:
+            if not etag:
+                print(f"{name:<12} skipped, no ETag")
+                continue
+            headers["If-None-Match"] = etag
+
+        rate, p50, p99, size, errors = run_scenario(url, headers, seconds, connections)
+        print(f"{name:<12} {rate:>10.0f} {p50:>9.2f} {p99:>9.2f} {size:>9} {errors:>7}")
+
+
+
+if __name__ == "__main__":
+    main()
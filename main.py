@@ -1,16 +1,13 @@
-import clean_data
-import toto_analysis
-import monte_carlo
-import backtest
-from random import randint
 import os
+import importlib.util
 
-# Import scraper functionality
-try:
-    from scraper_final import scrape_toto_results_final, scrape_multiple_pages
-    SCRAPER_AVAILABLE = True
-except ImportError:
-    SCRAPER_AVAILABLE = False
+# Analysis modules pull in pandas, matplotlib and scipy, and the scraper pulls in
+# requests and BeautifulSoup. They are imported when a menu option first needs
+# them so the menu shows up straight away (see startup_benchmark.py)
+
+# Check scraper packages are installed without importing them
+SCRAPER_AVAILABLE = all(importlib.util.find_spec(name) is not None for name in ("requests", "bs4"))
+if not SCRAPER_AVAILABLE:
     print("Warning: Scraper not available. Install required packages: pip install requests beautifulsoup4")
 
 def main():
@@ -47,6 +44,7 @@ def main():
                 continue
             menu2(file)
         elif choice == "3":
+            import monte_carlo
             print("Generating Monte Carlo simulated data...")
             monte_carlo.monte_carlo_simulation(100000)
             file = "simulated_draws.csv"
@@ -75,6 +73,9 @@ def download_fresh_data():
     
     choice = input("Choice: ")
     
+    if choice in ("1", "2"):
+        from scraper_final import scrape_toto_results_final, scrape_multiple_pages
+    
     if choice == "1":
         print("\n🔄 Downloading recent TOTO data...")
         results = scrape_toto_results_final()
@@ -104,26 +105,31 @@ def download_fresh_data():
 
 def menu2(file):
 
-    # Loads data from CSV file
-    results, column_names = clean_data.load_data(file)
-
-    # Checks if any errors occured when loading data
-    if results is None or column_names is None:
-        return
+    import dataset
+    import toto_analysis
+    import backtest
 
     while True:
 
-        if (file == "toto_results.csv"):
-            # Cleans results (from 3rd party so dk if its clean)
-            clean_results = clean_data.clean_data(results)
+        # Loaded and cleaned once per session, only reloaded if the file changed.
+        # Charts read the count tables cached on it instead of rescanning the data
+        # (past results are from 3rd party so dk if its clean, simulated data we
+        # generated ourselves so no need to clean)
+        workspace = dataset.get_dataset(file)
+
+        # Checks if any errors occured when loading data
+        if workspace is None:
+            return
 
+        clean_results = workspace.results
+        column_names = workspace.column_names
+
+        if (file == "toto_results.csv"):
             print("=" * 60)
             print("Past Results(toto_results.csv)".center(60))
             print("-" * 60)
 
         else:
-            # No need to clean as we generated ourselves and know its clean
-            clean_results = results
             print("=" * 60)
             print("Monte Carlo Simulated Results(simulated_results.csv)".center(60))
             print("-" * 60)
@@ -137,6 +143,10 @@ def menu2(file):
             "5. Backtest \n" \
             "6. Backtest with positional ranges \n" \
             "7. Quick summary analysis \n" \
+            "8. Pair co-occurrence heatmap \n" \
+            "9. Rolling frequency chart \n" \
+            "10. Query draws \n" \
+            "11. Most similar past draws \n" \
             "0. Back \n" \
             "------------------------------------------------------------\n" \
             "Choice: ")
@@ -144,13 +154,13 @@ def menu2(file):
         if choice == "0":
             break
         elif choice == "1":
-            toto_analysis.individual_bar_chart(clean_results, column_names)
+            toto_analysis.individual_bar_chart(workspace, column_names)
         elif choice == "2":
-            toto_analysis.grouped_bar_chart(clean_results, column_names)
+            toto_analysis.grouped_bar_chart(workspace, column_names)
         elif choice == "3":
-            toto_analysis.overall_frequency_chart(clean_results)
+            toto_analysis.overall_frequency_chart(workspace)
         elif choice == "4":
-            toto_analysis.confidence_interval(clean_results)
+            toto_analysis.confidence_interval(workspace)
         elif choice == "5":            
             backtest.backtest(clean_results)
         elif choice == "6":
@@ -163,51 +173,109 @@ def menu2(file):
 
             backtest.backtest_with_position_ranges(clean_results, position_ranges)
         elif choice == "7":
-            quick_summary(clean_results, file)
+            quick_summary(workspace, file)
+        elif choice == "8":
+            toto_analysis.co_occurrence_chart(workspace)
+        elif choice == "9":
+            toto_analysis.rolling_frequency_chart(workspace.frequency_cube)
+        elif choice == "10":
+            query_menu(workspace)
+        elif choice == "11":
+            backtest.similar_draws(workspace)
         else:
             print("Invalid choice! Try again")
 
-def quick_summary(results, file_type):
+def read_numbers(prompt):
+    """
+    Numbers from 1-49 separated by spaces or commas, empty list if left blank
+    """
+    while True:
+        try:
+            numbers = [int(n) for n in input(prompt).replace(",", " ").split()]
+        except ValueError:
+            print("Invalid input. Please enter whole numbers.")
+            continue
+
+        if all(1 <= n <= 49 for n in numbers):
+            return numbers
+        print("Number not in range 1-49! Try again")
+
+def query_menu(workspace):
+    """
+    Find the draws containing / not containing given numbers (workspace is a dataset.TotoDataset)
+    """
+    print("=" * 60)
+    print("Query Draws".center(60))
+    print("-" * 60)
+
+    index = workspace.inverted_index
+
+    all_of = read_numbers("Numbers that must all be drawn (e.g. 7 23): ")
+    none_of = read_numbers("Numbers that must not be drawn (e.g. 41): ")
+    while True:
+        additional = read_numbers("Additional number (blank for any): ")
+        if len(additional) <= 1:
+            break
+        print("Only one additional number is drawn! Enter one number or leave it blank")
+    include_additional = input("Count the additional number as drawn too? (y/n): ").strip().lower() == "y"
+
+    start_date = None
+    if index.dates is not None:
+        start_date = input("Since date (YYYY-MM-DD, blank for all): ").strip() or None
+
+    mask = index.query(all_of=all_of, none_of=none_of, additional=additional[0] if additional else None,
+                       start_date=start_date, include_additional=include_additional)
+    matches = index.table(mask)
+
+    print(f"\n🔎 {len(matches)} of {index.draws} draws match")
+    if len(matches):
+        print(matches.head(20).to_string(index=False))
+        if len(matches) > 20:
+            print(f"... and {len(matches) - 20} more")
+
+def quick_summary(workspace, file_type):
     """
-    Provide a quick summary of the data
+    Provide a quick summary of the data (workspace is a dataset.TotoDataset)
     """
+    import numpy as np
+
     print("=" * 60)
     print("Quick Summary Analysis".center(60))
     print("-" * 60)
     
     print(f"📊 Dataset: {file_type}")
-    print(f"📈 Total draws: {len(results)}")
+    print(f"📈 Total draws: {len(workspace)}")
     
-    # Overall frequency
-    all_numbers = []
-    for col in results.columns:
-        all_numbers.extend(results[col].tolist())
-    
-    from collections import Counter
-    freq = Counter(all_numbers)
+    # Overall frequency (precomputed for numbers 1-49)
+    freq = workspace.frequencies[1:]
     
     print(f"\n🎯 Most frequent numbers:")
-    for num, count in freq.most_common(5):
-        print(f"   {num}: {count} times")
+    for i in np.argsort(-freq, kind="stable")[:5]:
+        print(f"   {i + 1}: {freq[i]} times")
     
     print(f"\n📉 Least frequent numbers:")
-    for num, count in sorted(freq.items())[:5]:
-        print(f"   {num}: {count} times")
+    for i in np.argsort(freq, kind="stable")[:5]:
+        print(f"   {i + 1}: {freq[i]} times")
+    
+    # Recent frequency from the prefix sums (one subtraction)
+    recent = min(100, len(workspace))
+    recent_freq = workspace.frequency_cube.overall(-recent)[1:]
+    print(f"\n🕒 Most frequent in the last {recent} draws:")
+    for i in np.argsort(-recent_freq, kind="stable")[:5]:
+        print(f"   {i + 1}: {recent_freq[i]} times")
     
     # Position analysis
     print(f"\n📍 Position analysis (most common per position):")
-    for i, col in enumerate(results.columns[:6]):
-        most_common = results[col].value_counts().head(3)
-        print(f"   {col}: {list(most_common.index)}")
+    for i, col in enumerate(workspace.column_names[:6]):
+        most_common = np.argsort(-workspace.position_counts[i], kind="stable")[:3]
+        print(f"   {col}: {most_common.tolist()}")
     
     # Statistical insights
     print(f"\n📊 Statistical insights:")
-    print(f"   Expected frequency per number: {len(results) * 7 / 49:.1f}")
+    print(f"   Expected frequency per number: {len(workspace) * 7 / 49:.1f}")
     
     # Calculate actual standard deviation
-    import numpy as np
-    freq_values = list(freq.values())
-    std_dev = np.std(freq_values)
+    std_dev = np.std(freq)
     print(f"   Standard deviation of frequencies: {std_dev:.2f}")
     
     # Check data freshness
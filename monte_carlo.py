@@ -1,34 +1,84 @@
+import os
 import pandas as pd
 import numpy as np
+from checkpoint import load_checkpoint, save_checkpoint, clear_checkpoint, Progress
 
 
 
-def monte_carlo_simulation(num_draws=100000):
-    
-    print("Generating random values...")
+# Draws generated (and checkpointed) at a time
+CHUNK_SIZE = 100000
+
+# Checkpoint name used to resume an interrupted simulation
+SIMULATION_CHECKPOINT = "monte_carlo_simulation"
+
+
+
+def generate_draws(num_draws, rng=None):
+    """
+    Generate num_draws random draws as an (num_draws, 7) array
+
+    Num1 - Num6 are 6 unique numbers from 1-49 sorted ascending, Num7 is the
+    additional number which is different from the first 6. rng is a numpy
+    Generator (e.g. seeded per worker process), a fresh one is used if not given
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    # Shuffling 1-49 for each draw and taking the first 7 picks 7 unique numbers
+    picks = rng.random((num_draws, 49)).argsort(axis=1)[:, :7] + 1
+
+    # Sort the 6 winning numbers, additional number stays unsorted
+    picks[:, :6].sort(axis=1)
+
+    return picks
 
-    draws = []
 
-    for _ in range(num_draws):
-        # Pick 6 unique numbers from 1-49
-        winning_nums = np.random.choice(range(1, 50), size=6, replace=False)
-        winning_nums.sort()
 
-        # Pick 7th additional number, different from first 6
-        remaining_nums = set(range(1, 50)) - set(winning_nums)
-        additional_num = np.random.choice(list(remaining_nums), size=1)[0]
+def monte_carlo_simulation(num_draws=100000, output_file="simulated_draws.csv", resume=True):
 
-        # Combine into a single draw record
-        draw = list(winning_nums) + [additional_num]
-        draws.append(draw)
+    print("Generating random values...")
 
-    # Step 4: Build DataFrame with same columns as your real data
     column_names = ['Num1', 'Num2', 'Num3', 'Num4', 'Num5', 'Num6', 'Num7']
-    df_simulated = pd.DataFrame(draws, columns=column_names)
+
+    # Draws are appended to a partial file chunk by chunk and only renamed to
+    # the output file at the end, so an interrupted run never leaves a short file behind
+    partial_file = output_file + ".partial"
+
+    done = 0
+    state = load_checkpoint(SIMULATION_CHECKPOINT) if resume else None
+
+    # Only resume a checkpoint for the same simulation
+    if (state is not None and state["num_draws"] == num_draws and state["output_file"] == output_file
+            and os.path.exists(partial_file)):
+        done = state["done"]
+
+        # Drop any rows written after the last checkpoint was saved
+        with open(partial_file, "r+b") as f:
+            f.truncate(state["offset"])
+
+        print(f"🔁 Resuming simulation from {done}/{num_draws} draws")
+    else:
+        pd.DataFrame(columns=column_names).to_csv(partial_file, index=False)
+
+    progress = Progress(num_draws, label="Draws", start=done)
+
+    while done < num_draws:
+        chunk = generate_draws(min(CHUNK_SIZE, num_draws - done))
+        pd.DataFrame(chunk, columns=column_names).to_csv(partial_file, mode="a", header=False, index=False)
+        done += len(chunk)
+
+        save_checkpoint(SIMULATION_CHECKPOINT, {
+            "num_draws": num_draws,
+            "output_file": output_file,
+            "done": done,
+            "offset": os.path.getsize(partial_file),
+        })
+        progress.update(done)
 
     print("Generating file...")
 
-    df_simulated.to_csv("simulated_draws.csv", index=False)
+    os.replace(partial_file, output_file)
+    clear_checkpoint(SIMULATION_CHECKPOINT)
 
     print("File generated!")
 
@@ -39,4 +89,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,66 @@
+# Importing relevant libraries
+from math import comb
+import numpy as np
+
+
+
+# TOTO draws 6 winning numbers + 1 additional number from 1-49
+NUMBERS = 49
+WINNING = 6
+
+
+
+def position_probabilities():
+    """
+    (7, 50) probability of each number per column under a fair draw, column 0 is unused
+
+    Num1 - Num6 are sorted, so Num k is the k-th smallest of 6 numbers drawn
+    from 49: P(Num k = x) = C(x-1, k-1) * C(49-x, 6-k) / C(49, 6).
+    This is why the per position charts look skewed, Num1 is mostly small
+    numbers and Num6 mostly big ones.
+    Num7 (additional number) is equally likely to be any number
+    """
+    # Binomial coefficients C(n, r) for n = 0-49, r = 0-5
+    binomial = np.array([[comb(n, r) for r in range(WINNING)] for n in range(NUMBERS + 1)], dtype=float)
+
+    x = np.arange(1, NUMBERS + 1)
+    k = np.arange(1, WINNING + 1)[:, None]
+
+    probabilities = np.zeros((WINNING + 1, NUMBERS + 1))
+    probabilities[:WINNING, 1:] = binomial[x - 1, k - 1] * binomial[NUMBERS - x, WINNING - k] / comb(NUMBERS, WINNING)
+    probabilities[WINNING, 1:] = 1 / NUMBERS
+
+    return probabilities
+
+
+
+# Computed once on import, read only so callers can't change it by accident
+POSITION_PROBABILITIES = position_probabilities()
+POSITION_PROBABILITIES.setflags(write=False)
+
+
+
+def expected_counts(num_draws, columns=range(WINNING + 1)):
+    """
+    Expected count of each number (1-49) per column for num_draws fair draws
+
+    columns are column indexes (0 = Num1 ... 6 = Num7), returns a (len(columns), 49) array
+    """
+    return num_draws * POSITION_PROBABILITIES[list(columns), 1:]
+
+
+
+def position_residuals(counts, num_draws, columns=range(WINNING + 1)):
+    """
+    Standardized residuals (observed - expected) / sqrt(expected) per column
+
+    counts is a (len(columns), 49) array of observed counts for numbers 1-49.
+    Numbers a column can never hold (e.g. 49 as Num1) get a residual of 0
+    """
+    expected = expected_counts(num_draws, columns)
+    counts = np.asarray(counts, dtype=float)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        residuals = np.where(expected > 0, (counts - expected) / np.sqrt(expected), 0.0)
+
+    return residuals
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Headless batch rendering of the whole chart set to images/
+Renders individual, grouped, overall, confidence interval, pair co-occurrence
+and comparison charts for each dataset in parallel worker processes
+
+Usage: python render_charts.py [output_dir]
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+# No display needed, set before pyplot is imported anywhere (also in workers)
+import matplotlib
+matplotlib.use("Agg")
+
+import pandas as pd
+import dataset
+import toto_analysis
+from summary_analysis import comparison_chart
+
+# Datasets to render and the prefix of their image files (simulated charts start with S_)
+DATASETS = {"toto_results.csv": "", "simulated_draws.csv": "S_"}
+OUTPUT_DIR = "images"
+
+
+
+class ChartData:
+    """
+    Just the count tables of a dataset the charts need, small enough to send to worker processes
+    """
+
+    def __init__(self, data):
+        self.position_counts = data.position_counts
+        self.co_occurrence = data.co_occurrence
+        self.column_names = data.column_names
+        self.draws = len(data)
+
+    def __len__(self):
+        return self.draws
+
+
+
+def render_chart(kind, data, save_dir, prefix=""):
+    """
+    Render one kind of chart for one dataset to save_dir (runs in a worker process)
+    """
+    if kind == "individual":
+        toto_analysis.individual_bar_chart(data, data.column_names, save_dir=save_dir, prefix=prefix)
+    elif kind == "grouped":
+        toto_analysis.grouped_bar_chart(data, data.column_names, save_dir=save_dir, prefix=prefix)
+    elif kind == "overall":
+        toto_analysis.overall_frequency_chart(data, save_dir=save_dir, prefix=prefix)
+    elif kind == "ci":
+        toto_analysis.confidence_interval_chart(data, data.column_names, save_dir=save_dir, prefix=prefix)
+    elif kind == "co_occurrence":
+        toto_analysis.co_occurrence_chart(data, save_dir=save_dir, prefix=prefix)
+    elif kind == "comparison":
+        real, sim = data
+        comparison_chart(pd.Series(real.position_counts.sum(axis=0)[1:], index=range(1, 50)),
+                         pd.Series(sim.position_counts.sum(axis=0)[1:], index=range(1, 50)),
+                         len(real), len(sim), path=os.path.join(save_dir, "comparison_analysis.png"), show=False)
+    else:
+        raise ValueError(f"Unknown chart: {kind}")
+
+    return kind, prefix
+
+
+
+def chart_tasks(charts):
+    """
+    (kind, data, prefix) for every chart to render, charts maps a prefix to its ChartData
+    """
+    tasks = []
+
+    for prefix, data in charts.items():
+        for kind in ("individual", "grouped", "overall", "ci", "co_occurrence"):
+            tasks.append((kind, data, prefix))
+
+    # Comparison needs both real and simulated data
+    if "" in charts and "S_" in charts:
+        tasks.append(("comparison", (charts[""], charts["S_"]), ""))
+
+    return tasks
+
+
+
+def render_all(files=None, save_dir=OUTPUT_DIR, workers=None):
+    """
+    Render the whole chart set for the given datasets (file -> prefix) in parallel
+
+    Datasets are loaded once here, workers only receive their count tables.
+    Missing files are skipped and rows with errors are skipped without asking.
+    Returns True if every chart was rendered
+    """
+    files = files or DATASETS
+    os.makedirs(save_dir, exist_ok=True)
+
+    charts = {}
+    for file, prefix in files.items():
+        if not os.path.exists(file):
+            print(f"⏭️  {file} not found, skipping its charts")
+            continue
+
+        data = dataset.get_dataset(file, prompt=False)
+        if data is None:
+            return False
+        charts[prefix] = ChartData(data)
+
+    tasks = chart_tasks(charts)
+    success = True
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(render_chart, kind, data, save_dir, prefix) for kind, data, prefix in tasks]
+
+        for future in futures:
+            try:
+                kind, prefix = future.result()
+                print(f"🖼️  Rendered {prefix}{kind} charts")
+            except Exception as e:
+                print(f"❌ Error rendering chart: {e}")
+                success = False
+
+    print(f"✅ Charts saved to {save_dir}/" if success else "❌ Some charts failed to render")
+    return success
+
+
+
+def main():
+    save_dir = sys.argv[1] if len(sys.argv) > 1 else OUTPUT_DIR
+    sys.exit(0 if render_all(save_dir=save_dir) else 1)
+
+
+
+if __name__ == "__main__":
+    main()
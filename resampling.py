@@ -0,0 +1,135 @@
+# Importing relevant libraries
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import numpy as np
+import pandas as pd
+import monte_carlo
+from summary_analysis import pattern_statistics
+
+
+
+# Simulated draws generated per batch (batch size in datasets = this / draws per dataset)
+DRAWS_PER_BATCH = 200000
+
+
+
+def simulate_batch(seed, num_datasets, num_draws):
+    """
+    Pattern statistics of num_datasets simulated histories of num_draws draws each
+
+    Runs in a worker process. Returns a (num_datasets, statistics) array with
+    the average of every pattern statistic per simulated history
+    """
+    rng = np.random.default_rng(seed)
+    draws = monte_carlo.generate_draws(num_datasets * num_draws, rng=rng)
+    stats = pattern_statistics(draws).astype(float)
+
+    # Average each simulated history separately
+    return stats.to_numpy().reshape(num_datasets, num_draws, -1).mean(axis=1)
+
+
+
+def p_values(observed, simulated):
+    """
+    Two sided p-values of the observed statistics against the simulated ones
+
+    A simulated value counts as extreme if it is at least as far from the
+    simulated mean as the observed value. Returns the p-values and their standard errors
+    """
+    center = simulated.mean(axis=0)
+    extreme = np.abs(simulated - center) >= np.abs(observed - center) - 1e-12
+    n = len(simulated)
+
+    p = (extreme.sum(axis=0) + 1) / (n + 1)
+    se = np.sqrt(p * (1 - p) / n)
+
+    return p, se
+
+
+
+def resampling_test(numbers, precision=0.005, min_samples=2000, max_samples=200000, workers=None, seed=None):
+    """
+    p-values for the pattern statistics of a draw history by simulation
+
+    numbers is an (N, 6) or (N, 7) array of draws (dataset.TotoDataset.numbers).
+    Random histories of the same length are simulated in batches on a process
+    pool until every p-value is known to within precision (standard error)
+    or max_samples histories have been simulated
+    """
+    numbers = np.asarray(numbers)
+    num_draws = len(numbers)
+    observed_table = pattern_statistics(numbers).astype(float)
+    observed = observed_table.mean().to_numpy()
+
+    batch_size = max(1, DRAWS_PER_BATCH // num_draws)
+    workers = workers or os.cpu_count() or 1
+    seeds = np.random.SeedSequence(seed)
+
+    simulated = []
+    samples = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Keep every worker busy with one batch
+        pending = {pool.submit(simulate_batch, seeds.spawn(1)[0], batch_size, num_draws) for _ in range(workers)}
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                batch = future.result()
+                simulated.append(batch)
+                samples += len(batch)
+
+            # Sequential stopping rule: stop once every p-value is precise enough
+            p, se = p_values(observed, np.concatenate(simulated))
+            precise = samples >= min_samples and (se <= precision).all()
+            print(f"Simulated {samples} histories, largest p-value error {se.max():.4f}")
+
+            if precise or samples >= max_samples:
+                for future in pending:
+                    future.cancel()
+                break
+
+            # Top up the pool for the batches that finished
+            pending |= {pool.submit(simulate_batch, seeds.spawn(1)[0], batch_size, num_draws) for _ in done}
+
+    simulated = np.concatenate(simulated)
+    p, se = p_values(observed, simulated)
+
+    return pd.DataFrame({
+        'statistic': observed_table.columns,
+        'observed': observed,
+        'expected': simulated.mean(axis=0),
+        'null_std': simulated.std(axis=0),
+        'p_value': p,
+        'p_error': se,
+        'samples': len(simulated),
+    })
+
+
+
+def main():
+    """
+    Resampling p-values for the pattern statistics of toto_results.csv
+    """
+    import dataset
+
+    file = sys.argv[1] if len(sys.argv) > 1 else "toto_results.csv"
+    data = dataset.get_dataset(file)
+    if data is None:
+        return
+
+    print("=" * 60)
+    print("Resampling Test of Pattern Statistics".center(60))
+    print("-" * 60)
+
+    table = resampling_test(data.numbers)
+
+    print(f"\nPattern statistics of {len(data)} draws vs simulated fair draws:")
+    print(table.round(4).to_string(index=False))
+
+
+
+if __name__ == "__main__":
+    main()
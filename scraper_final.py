@@ -5,6 +5,12 @@ import re
 from bs4 import BeautifulSoup
 import json
 import os
+from datetime import datetime
+from checkpoint import load_checkpoint, save_checkpoint, clear_checkpoint, Progress
+from draw_calendar import last_draw_due, now_sgt
+
+# Checkpoint name used to resume an interrupted multi page scrape
+SCRAPE_CHECKPOINT = "scrape_multiple_pages"
 
 def scrape_toto_results_final():
     """
@@ -121,9 +127,27 @@ def scrape_toto_results_final():
         print(f"Error: {e}")
         return None
 
-def scrape_multiple_pages():
+def checkpoint_is_current(state):
+    """
+    True if no new draw has been published since the checkpointed scrape started
+
+    Results are listed newest first, so a new draw shifts every page and the
+    saved page number no longer points at the next unseen results
+    """
+    try:
+        started = datetime.fromisoformat(state["started"])
+    except (KeyError, TypeError, ValueError):
+        return False
+
+    return last_draw_due(started) == last_draw_due()
+
+def scrape_multiple_pages(resume=True):
     """
     Scrape multiple pages to get more historical data
+
+    Progress is checkpointed after every page, so if a page fails the next
+    call picks up from that page instead of starting again from page 1.
+    toto_results.csv is only written once every page has been scraped
     """
     print("\n" + "=" * 60)
     print("Scraping Multiple Pages".center(60))
@@ -132,6 +156,26 @@ def scrape_multiple_pages():
     all_results = []
     page = 1
     max_pages = 35  # Should cover several years of data
+    started = now_sgt().isoformat()
+    newest_date = None
+    
+    # Resume from last saved page if a previous scrape was interrupted,
+    # unless a draw was published since (then every page has shifted)
+    state = load_checkpoint(SCRAPE_CHECKPOINT) if resume else None
+    if state is not None and not checkpoint_is_current(state):
+        print("🔄 New draw published since the saved scrape started, starting again from page 1")
+        clear_checkpoint(SCRAPE_CHECKPOINT)
+        state = None
+    
+    if state is not None:
+        all_results = state["results"]
+        page = state["next_page"]
+        started = state["started"]
+        newest_date = state.get("newest_date")
+        print(f"🔁 Resuming from page {page} ({len(all_results)} results already scraped, newest {newest_date})")
+    
+    progress = Progress(max_pages, label="Pages", start=page - 1)
+    completed = True
     
     headers = {
         'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -209,17 +253,39 @@ def scrape_multiple_pages():
             all_results.extend(page_results)
             print(f"Found {len(page_results)} results on page {page}")
             
+            if newest_date is None:
+                newest_date = page_results[0]['Date']
+            
+            # Save progress so this page is not scraped again on resume
+            save_checkpoint(SCRAPE_CHECKPOINT, {"started": started, "newest_date": newest_date,
+                                                "next_page": page + 1, "results": all_results})
+            progress.update(page)
+            
             # Be respectful - add delay between requests
             time.sleep(1)
             page += 1
             
         except Exception as e:
             print(f"Error on page {page}: {e}")
+            print(f"💾 Progress saved. Run again to resume from page {page}.")
+            completed = False
             break
     
+    # Only forget progress (and replace the data) once the scrape ran to the end,
+    # a partial scrape would overwrite the full history with a few pages
+    if not completed:
+        print(f"⚠️  Scrape incomplete, {len(all_results)} results kept in the checkpoint, toto_results.csv not changed")
+        return None
+    
+    clear_checkpoint(SCRAPE_CHECKPOINT)
+    
     if all_results:
-        print(f"\nTotal results scraped: {len(all_results)}")
-        df = pd.DataFrame(all_results)
+        # A draw can show up on two pages if the listing moved during the scrape
+        df = pd.DataFrame(all_results).drop_duplicates(subset='Date', keep='first')
+        if len(df) < len(all_results):
+            print(f"Removed {len(all_results) - len(df)} duplicate draws")
+        
+        print(f"\nTotal results scraped: {len(df)}")
         df.to_csv("toto_results.csv", index=False)
         print("All results saved to toto_results.csv")
         
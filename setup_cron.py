@@ -110,6 +110,79 @@ def setup_cron_job():
         print(f"❌ Error setting up cron job: {e}")
         return False
 
+def setup_daemon_job():
+    """
+    Set up the resident scheduler (auto_update.py daemon) instead of a cron job per update
+
+    The daemon keeps imports and data loaded and wakes on the draw calendar,
+    so cron only has to start it once at boot. Earlier per-run cron jobs of
+    auto_update.py are replaced, otherwise cron and the daemon would both run the pipeline
+    """
+    print("=" * 60)
+    print("TOTO Resident Scheduler Setup".center(60))
+    print("=" * 60)
+    
+    project_path = get_project_path()
+    python_path = sys.executable
+    auto_update_script = os.path.join(project_path, "auto_update.py")
+    
+    if not os.path.exists(auto_update_script):
+        print("❌ auto_update.py not found!")
+        return False
+    
+    cron_command = f"@reboot cd {project_path} && {python_path} {auto_update_script} daemon >> {project_path}/toto_update.log 2>&1"
+    
+    print(f"\n📋 Cron command to be added:")
+    print(cron_command)
+    
+    confirm = input("\n❓ Add this cron job? (y/n): ").lower().strip()
+    
+    if confirm != 'y':
+        print("Setup cancelled.")
+        return False
+    
+    try:
+        result = subprocess.run(['crontab', '-l'], capture_output=True, text=True)
+        current_crontab = result.stdout
+        
+        # Every other auto_update.py job (per-run updates) is replaced by the daemon
+        lines = current_crontab.split('\n')
+        replaced = [line for line in lines if 'auto_update.py' in line and line != cron_command]
+        kept = [line for line in lines if 'auto_update.py' not in line or line == cron_command]
+        
+        if cron_command in kept and not replaced:
+            print("⚠️  Cron job already exists!")
+        else:
+            new_crontab = '\n'.join(kept).rstrip('\n') + "\n"
+            if cron_command not in kept:
+                new_crontab += cron_command + "\n"
+            result = subprocess.run(['crontab', '-'], input=new_crontab, text=True, capture_output=True)
+            
+            if result.returncode != 0:
+                print(f"❌ Failed to add cron job: {result.stderr}")
+                return False
+            
+            for line in replaced:
+                print(f"🗑️  Removed per-run job: {line}")
+            print("✅ Cron job added successfully!")
+        
+        # Start it now as well, otherwise it only runs after the next reboot
+        # (a daemon that is already running keeps running, a second one exits)
+        start_now = input("❓ Start the scheduler now? (y/n): ").lower().strip()
+        if start_now == 'y':
+            with open(os.path.join(project_path, "toto_update.log"), "a") as log:
+                process = subprocess.Popen([python_path, auto_update_script, "daemon"], cwd=project_path,
+                                           stdout=log, stderr=log, stdin=subprocess.DEVNULL,
+                                           start_new_session=True)
+            print(f"✅ Scheduler started (pid {process.pid})")
+        
+        print(f"📝 Log files: {project_path}/toto_update.log, {project_path}/toto_daemon.log")
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error setting up scheduler: {e}")
+        return False
+
 def remove_cron_job():
     """
     Remove existing TOTO cron jobs
@@ -206,6 +279,7 @@ def main():
     print("2. Remove automated updates")
     print("3. List current cron jobs")
     print("4. Test auto update functionality")
+    print("5. Setup resident scheduler (daemon started at boot)")
     print("0. Exit")
     
     choice = input("Choice: ")
@@ -218,6 +292,8 @@ def main():
         list_cron_jobs()
     elif choice == "4":
         test_auto_update()
+    elif choice == "5":
+        setup_daemon_job()
     elif choice == "0":
         print("Goodbye!")
     else:
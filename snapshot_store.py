@@ -0,0 +1,189 @@
+# Importing relevant libraries
+import hashlib
+import json
+import os
+from datetime import datetime
+import pandas as pd
+
+
+
+# Append-only history of toto_results.csv
+# Every update only stores the draws that are new since the previous snapshot
+# (a delta), named by the hash of its content so identical deltas are stored once
+SNAPSHOT_DIR = "snapshots"
+MANIFEST_FILE = os.path.join(SNAPSHOT_DIR, "manifest.jsonl")
+DELTA_DIR = os.path.join(SNAPSHOT_DIR, "deltas")
+
+# The full data is also stored (named by its state hash) for the latest snapshot
+# and every BASE_INTERVAL-th one, so loading only replays the deltas after the
+# nearest stored state instead of every delta since the first snapshot
+STATE_DIR = os.path.join(SNAPSHOT_DIR, "states")
+BASE_INTERVAL = 50
+
+RESULTS_COLUMNS = ['Date', 'Winning Number 1', '2', '3', '4', '5', '6', 'Additional Number']
+
+
+
+def list_snapshots():
+    """
+    List all snapshots, oldest first
+    """
+    if not os.path.exists(MANIFEST_FILE):
+        return []
+
+    with open(MANIFEST_FILE, "r") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+
+def find_snapshot(snapshots, ref):
+    """
+    Find a snapshot by position in the list (int) or by (a prefix of) its hash (str)
+    """
+    if isinstance(ref, int):
+        return snapshots[ref]
+
+    matches = [s for s in snapshots if s["hash"].startswith(ref)]
+    if len(matches) != 1:
+        raise KeyError(f"No unique snapshot matching {ref!r}")
+
+    return matches[0]
+
+
+
+def load_snapshot(ref=-1):
+    """
+    Rebuild toto_results.csv as it was at a snapshot (latest by default)
+
+    Starts from the nearest stored state at or before that snapshot and only
+    reads the deltas after it, newest draws first like the scraped CSV
+    """
+    snapshots = list_snapshots()
+    if not snapshots:
+        return pd.DataFrame(columns=RESULTS_COLUMNS)
+
+    target = find_snapshot(snapshots, ref)
+    end = next(i for i, snapshot in enumerate(snapshots) if snapshot is target)
+
+    # Walk back to the latest stored state, older manifests may have none
+    start = end
+    while start >= 0 and not os.path.exists(state_path(snapshots[start]["hash"])):
+        start -= 1
+
+    parts = [read_state(snapshots[start]["hash"])] if start >= 0 else []
+    parts += [read_delta(snapshot["delta"]) for snapshot in snapshots[start + 1:end + 1]]
+
+    return sort_draws(pd.concat(parts, ignore_index=True))
+
+
+
+def record_snapshot(results):
+    """
+    Record the draws in results that are not in the latest snapshot yet
+
+    Returns the full reconstructed data (old draws + new draws) and the new
+    manifest entry, or None as the entry if there was nothing new to store
+    """
+    snapshots = list_snapshots()
+    current = load_snapshot() if snapshots else pd.DataFrame(columns=RESULTS_COLUMNS)
+
+    # A draw is identified by its date
+    results = results[RESULTS_COLUMNS]
+    new_draws = results[~results["Date"].astype(str).isin(current["Date"].astype(str))]
+    new_draws = sort_draws(new_draws.drop_duplicates(subset="Date"))
+
+    if new_draws.empty:
+        return current, None
+
+    # Content address the delta
+    delta_text = new_draws.to_csv(index=False)
+    delta_hash = hashlib.sha256(delta_text.encode()).hexdigest()
+    delta_file = os.path.join(DELTA_DIR, f"{delta_hash}.csv")
+
+    os.makedirs(DELTA_DIR, exist_ok=True)
+    if not os.path.exists(delta_file):
+        with open(delta_file, "w") as f:
+            f.write(delta_text)
+
+    # The state hash chains the previous state with the delta, so it identifies
+    # the full data without having to hash the whole file again
+    parent_hash = snapshots[-1]["hash"] if snapshots else ""
+    state_hash = hashlib.sha256((parent_hash + delta_hash).encode()).hexdigest()
+
+    entry = {
+        "hash": state_hash,
+        "parent": parent_hash,
+        "delta": delta_hash,
+        "new_draws": len(new_draws),
+        "total_draws": len(current) + len(new_draws),
+        "latest_date": str(new_draws["Date"].max()),
+        "created": datetime.now().isoformat(timespec="seconds"),
+    }
+
+    # Append only, existing entries are never rewritten
+    with open(MANIFEST_FILE, "a") as f:
+        f.write(json.dumps(entry) + "\n")
+
+    merged = sort_draws(pd.concat([current, new_draws], ignore_index=True))
+
+    # Store the new latest state, the previous one is only kept if it is a base
+    os.makedirs(STATE_DIR, exist_ok=True)
+    merged.to_csv(state_path(state_hash), index=False)
+    if snapshots and (len(snapshots) - 1) % BASE_INTERVAL and os.path.exists(state_path(parent_hash)):
+        os.remove(state_path(parent_hash))
+
+    return merged, entry
+
+
+
+def read_delta(delta_hash):
+    """
+    Read a stored delta by its hash
+    """
+    return pd.read_csv(os.path.join(DELTA_DIR, f"{delta_hash}.csv"), dtype={"Date": str})
+
+
+
+def state_path(state_hash):
+    """
+    Path of the stored full data of a snapshot
+    """
+    return os.path.join(STATE_DIR, f"{state_hash}.csv")
+
+
+
+def read_state(state_hash):
+    """
+    Read the stored full data of a snapshot by its state hash
+    """
+    return pd.read_csv(state_path(state_hash), dtype={"Date": str})
+
+
+
+def sort_draws(results):
+    """
+    Sort draws newest first
+    """
+    return results.sort_values("Date", ascending=False, kind="stable").reset_index(drop=True)
+
+
+
+def main():
+    """
+    Print the snapshot history
+    """
+    snapshots = list_snapshots()
+
+    if not snapshots:
+        print("No snapshots recorded yet.")
+        return
+
+    print(f"{'#':>3} | {'Hash':<12} | {'Created':<19} | {'New':>4} | {'Total':>5} | Latest draw")
+    print("-" * 70)
+    for i, s in enumerate(snapshots):
+        print(f"{i:3d} | {s['hash'][:12]:<12} | {s['created']:<19} | {s['new_draws']:4d} | {s['total_draws']:5d} | {s['latest_date']}")
+
+
+
+if __name__ == "__main__":
+    main()
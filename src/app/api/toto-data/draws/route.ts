@@ -0,0 +1,92 @@
+import { NextResponse } from 'next/server';
+import { promises as fs } from 'fs';
+import path from 'path';
+import { DrawIndex, DrawQuery, RESULT_FIELDS, ResultField } from '@/lib/draw-index';
+
+// Histories that can be queried (?source=), read from the public folder
+const SOURCES: Record<string, string> = {
+  results: 'toto_results.csv',
+  simulated: 'simulated_draws.csv',
+};
+
+const MAX_LIMIT = 1000;
+
+// Indexed histories kept in memory for as long as the file's mtime and size do not change
+const indexes = new Map<string, { mtimeMs: number; size: number; index: DrawIndex }>();
+
+async function loadIndex(source: string): Promise<DrawIndex> {
+  const csvPath = path.join(process.cwd(), 'public', SOURCES[source]);
+  const stat = await fs.stat(csvPath);
+  const cached = indexes.get(source);
+  if (cached && cached.mtimeMs === stat.mtimeMs && cached.size === stat.size) {
+    return cached.index;
+  }
+
+  const index = DrawIndex.fromCsv(await fs.readFile(csvPath, 'utf-8'));
+  indexes.set(source, { mtimeMs: stat.mtimeMs, size: stat.size, index });
+  return index;
+}
+
+class QueryError extends Error {}
+
+function parseNumber(value: string, name: string, min: number, max: number): number {
+  const number = Number(value);
+  if (!Number.isInteger(number) || number < min || number > max) {
+    throw new QueryError(`${name} must be a whole number from ${min} to ${max}`);
+  }
+  return number;
+}
+
+function parseDate(value: string | null, name: string): string | undefined {
+  if (value === null) return undefined;
+  if (!/^\d{4}-\d{2}-\d{2}$/.test(value)) throw new QueryError(`${name} must be a date like 2024-01-31`);
+  return value;
+}
+
+// ?from=&to=&contains=7,23&additional=&order=asc|desc&offset=&limit=&fields=Date,2,3
+function parseQuery(params: URLSearchParams): { query: DrawQuery; fields: ResultField[] } {
+  const contains = params.get('contains');
+  const additional = params.get('additional');
+  const order = params.get('order') ?? 'desc';
+  if (order !== 'asc' && order !== 'desc') throw new QueryError('order must be asc or desc');
+
+  const query: DrawQuery = {
+    from: parseDate(params.get('from'), 'from'),
+    to: parseDate(params.get('to'), 'to'),
+    contains: contains ? [...new Set(contains.split(',').map(n => parseNumber(n, 'contains', 1, 49)))] : [],
+    additional: additional ? parseNumber(additional, 'additional', 1, 49) : undefined,
+    order,
+    offset: parseNumber(params.get('offset') ?? '0', 'offset', 0, Number.MAX_SAFE_INTEGER),
+    limit: parseNumber(params.get('limit') ?? '50', 'limit', 1, MAX_LIMIT),
+  };
+
+  const fields = (params.get('fields')?.split(',') ?? [...RESULT_FIELDS]) as ResultField[];
+  const unknown = fields.filter(field => !RESULT_FIELDS.includes(field));
+  if (unknown.length) throw new QueryError(`Unknown fields: ${unknown.join(', ')}`);
+
+  return { query, fields };
+}
+
+export async function GET(request: Request) {
+  const params = new URL(request.url).searchParams;
+  const source = params.get('source') ?? 'results';
+  if (!Object.hasOwn(SOURCES, source)) {
+    return NextResponse.json({ error: `source must be one of: ${Object.keys(SOURCES).join(', ')}` }, { status: 400 });
+  }
+
+  try {
+    const { query, fields } = parseQuery(params);
+    const index = await loadIndex(source);
+    if ((query.from || query.to) && !index.dates) {
+      throw new QueryError(`${source} draws have no dates`);
+    }
+
+    return NextResponse.json({ source, ...index.query(query, fields) });
+  } catch (error) {
+    if (error instanceof QueryError) {
+      return NextResponse.json({ error: error.message }, { status: 400 });
+    }
+    console.error('Error querying draws:', error);
+    return NextResponse.json({ error: 'Failed to load data' }, { status: 500 });
+  }
+} 
\ No newline at end of file
@@ -1,36 +1,107 @@
 import { NextResponse } from 'next/server';
 import { promises as fs } from 'fs';
+import { createHash } from 'crypto';
+import { brotliCompressSync, gzipSync, constants } from 'zlib';
 import path from 'path';
 
-export async function GET() {
+// Layout version of the stats file this route understands (stats_artifact.py ARTIFACT_VERSION)
+const ARTIFACT_VERSION = 1;
+
+// Clients may keep the response but must revalidate it (cheap 304 while the file is unchanged)
+const CACHE_CONTROL = 'public, max-age=0, must-revalidate';
+
+interface Representation {
+  body: Buffer;
+  etag: string;
+}
+
+interface CachedStats {
+  mtimeMs: number;
+  size: number;
+  identity: Representation;
+  gzip: Representation;
+  br: Representation;
+}
+
+// Loaded stats kept in memory for as long as the file's mtime and size do not change
+let cached: CachedStats | null = null;
+
+async function loadStats(statsPath: string): Promise<CachedStats> {
+  const stat = await fs.stat(statsPath);
+  if (cached && cached.mtimeMs === stat.mtimeMs && cached.size === stat.size) {
+    return cached;
+  }
+
+  // Written by `python stats_artifact.py`, everything is already computed
+  const body = await fs.readFile(statsPath);
+
+  // Only the version is checked, the body is sent as it was read
+  const version = Number(body.subarray(0, 32).toString('utf-8').match(/^\{"version":(\d+)/)?.[1]);
+  if (version !== ARTIFACT_VERSION) {
+    throw new Error(`Unsupported stats version ${version}, expected ${ARTIFACT_VERSION}`);
+  }
+
+  // Strong ETag from the content, each encoding is a different representation with its own tag
+  const hash = createHash('sha256').update(body).digest('base64url').slice(0, 27);
+
+  // Compressed once per file change, not per request
+  cached = {
+    mtimeMs: stat.mtimeMs,
+    size: stat.size,
+    identity: { body, etag: `"${hash}"` },
+    gzip: { body: gzipSync(body, { level: 9 }), etag: `"${hash}-gzip"` },
+    br: {
+      body: brotliCompressSync(body, { params: { [constants.BROTLI_PARAM_QUALITY]: 11 } }),
+      etag: `"${hash}-br"`,
+    },
+  };
+  return cached;
+}
+
+// Best encoding the client accepts: brotli, then gzip, otherwise none
+function pickEncoding(acceptEncoding: string | null): 'br' | 'gzip' | 'identity' {
+  const accepted = (acceptEncoding ?? '')
+    .split(',')
+    .map(part => part.trim().split(';'))
+    .filter(([, q]) => !q || parseFloat(q.split('=')[1]) > 0)
+    .map(([name]) => name.toLowerCase());
+
+  if (accepted.includes('br')) return 'br';
+  if (accepted.includes('gzip')) return 'gzip';
+  return 'identity';
+}
+
+export async function GET(request: Request) {
   try {
-    const csvPath = path.join(process.cwd(), 'public', 'toto_results.csv');
-    const csvData = await fs.readFile(csvPath, 'utf-8');
-    
-    // Parse CSV to JSON
-    const lines = csvData.split('\n');
-    const headers = lines[0].split(',');
-    const results = [];
-    
-    for (let i = 1; i < lines.length; i++) {
-      if (lines[i].trim()) {
-        const values = lines[i].split(',');
-        const row: any = {};
-        headers.forEach((header, index) => {
-          const value = values[index]?.trim();
-          if (header.includes('Number') || header === '2' || header === '3' || header === '4' || header === '5' || header === '6' || header === 'Additional Number') {
-            row[header] = parseInt(value) || 0;
-          } else {
-            row[header] = value;
-          }
-        });
-        results.push(row);
+    const stats = await loadStats(path.join(process.cwd(), 'public', 'toto_stats.json'));
+    const encoding = pickEncoding(request.headers.get('accept-encoding'));
+    const representation = stats[encoding];
+
+    const headers: Record<string, string> = {
+      'Cache-Control': CACHE_CONTROL,
+      'ETag': representation.etag,
+      'Vary': 'Accept-Encoding',
+    };
+
+    // Client already has this version of the stats (any encoding of it)
+    const ifNoneMatch = request.headers.get('if-none-match');
+    if (ifNoneMatch) {
+      const tags = ifNoneMatch.split(',').map(tag => tag.trim().replace(/^W\//, ''));
+      const current = [stats.identity.etag, stats.gzip.etag, stats.br.etag];
+      if (tags.includes('*') || tags.some(tag => current.includes(tag))) {
+        return new NextResponse(null, { status: 304, headers });
       }
     }
-    
-    return NextResponse.json({ data: results });
+
+    if (encoding !== 'identity') {
+      headers['Content-Encoding'] = encoding;
+    }
+
+    return new NextResponse(representation.body, {
+      headers: { ...headers, 'Content-Type': 'application/json', 'Content-Length': String(representation.body.length) },
+    });
   } catch (error) {
-    console.error('Error reading CSV file:', error);
+    console.error('Error reading stats file:', error);
     return NextResponse.json({ error: 'Failed to load data' }, { status: 500 });
   }
 } 
\ No newline at end of file
@@ -7,15 +7,14 @@ import { Badge } from '@/components/ui/badge';
 import { Button } from '@/components/ui/button';
 import { Progress } from '@/components/ui/progress';
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer, LineChart, Line, Area, AreaChart } from 'recharts';
-import { TotoAnalyzer } from '@/lib/toto-analysis';
-import { TotoResult, PredictionResult, StatisticalSummary } from '@/types/toto';
+import { TotoResult, TotoStats, PredictionResult, StatisticalSummary } from '@/types/toto';
 import { TrendingUp, TrendingDown, Target, Calendar, BarChart3, Zap } from 'lucide-react';
 import { PredictionCard } from '@/components/prediction-card';
 import { Footer } from '@/components/footer';
 
 export default function Home() {
   const [data, setData] = useState<TotoResult[]>([]);
-  const [analyzer, setAnalyzer] = useState<TotoAnalyzer | null>(null);
+  const [chartData, setChartData] = useState<TotoStats['chartData'] | null>(null);
   const [predictions, setPredictions] = useState<PredictionResult[]>([]);
   const [summary, setSummary] = useState<StatisticalSummary | null>(null);
   const [loading, setLoading] = useState(true);
@@ -26,12 +25,13 @@ export default function Home() {
         const response = await fetch('/api/toto-data');
         const result = await response.json();
         
-        if (result.data) {
-          setData(result.data);
-          const analyzerInstance = new TotoAnalyzer(result.data);
-          setAnalyzer(analyzerInstance);
-          setPredictions(analyzerInstance.generatePredictions());
-          setSummary(analyzerInstance.getStatisticalSummary());
+        // Statistics are precomputed by the Python pipeline, nothing to analyse here
+        if (result.summary) {
+          const stats = result as TotoStats;
+          setData(stats.recentDraws);
+          setChartData(stats.chartData);
+          setPredictions(stats.predictions);
+          setSummary(stats.summary);
         }
       } catch (error) {
         console.error('Error loading data:', error);
@@ -54,8 +54,6 @@ export default function Home() {
     );
   }
 
-  const chartData = analyzer?.getChartData();
-
   return (
     <div className="min-h-screen bg-gradient-to-br from-blue-50 to-indigo-100">
       <div className="container mx-auto px-4 py-8">
@@ -288,7 +286,7 @@ export default function Home() {
               <Card>
                 <CardHeader>
                   <CardTitle>Confidence Intervals</CardTitle>
-                  <CardDescription>95% confidence intervals for each number</CardDescription>
+                  <CardDescription>95% confidence intervals for each number (Bonferroni corrected across all 49)</CardDescription>
                 </CardHeader>
                 <CardContent>
                   <ResponsiveContainer width="100%" height={300}>
@@ -361,7 +359,7 @@ export default function Home() {
                 </div>
                 <div className="mt-4 text-center">
                   <p className="text-sm text-muted-foreground">
-                    Showing first 20 results of {data.length} total draws
+                    Showing first {data.length} results of {summary?.totalDraws ?? data.length} total draws
                   </p>
                 </div>
               </CardContent>
@@ -0,0 +1,184 @@
+import { TotoResult } from '@/types/toto';
+
+export const RESULT_FIELDS = ['Date', 'Winning Number 1', '2', '3', '4', '5', '6', 'Additional Number'] as const;
+
+export type ResultField = typeof RESULT_FIELDS[number];
+
+export interface DrawQuery {
+  from?: string;        // first date included (ISO, e.g. 2024-01-01)
+  to?: string;          // last date included
+  contains?: number[];  // every one of these is a winning number
+  additional?: number;  // additional number
+  order?: 'asc' | 'desc';
+  offset?: number;
+  limit?: number;
+}
+
+export interface DrawPage {
+  total: number;
+  offset: number;
+  limit: number;
+  data: Partial<TotoResult>[];
+}
+
+// First index in sorted values[lo, hi) that is >= target (strictly > with after = true)
+function lowerBound<T>(values: ArrayLike<T>, target: T, lo: number, hi: number, after = false): number {
+  while (lo < hi) {
+    const mid = (lo + hi) >>> 1;
+    if (values[mid] < target || (after && values[mid] === target)) {
+      lo = mid + 1;
+    } else {
+      hi = mid;
+    }
+  }
+  return lo;
+}
+
+/**
+ * Draw history in date order (oldest first) with indexes built once when it is loaded:
+ * the sorted dates for date ranges, and per number a posting list of the draws
+ * containing it (ascending draw indexes) as winning number and as additional number.
+ */
+export class DrawIndex {
+  readonly draws: number;
+  readonly dates: string[] | null;
+  readonly numbers: Uint8Array;  // draws x 7, Num1 - Num6 then the additional number
+  readonly winning: Int32Array[] = [];
+  readonly additional: Int32Array[] = [];
+
+  constructor(dates: string[] | null, numbers: Uint8Array) {
+    this.draws = numbers.length / 7;
+    this.dates = dates;
+    this.numbers = numbers;
+
+    // Count first so each posting list is one exact size typed array
+    const winningCounts = new Int32Array(50);
+    const additionalCounts = new Int32Array(50);
+    for (let i = 0; i < this.draws; i++) {
+      for (let j = 0; j < 6; j++) winningCounts[numbers[i * 7 + j]]++;
+      additionalCounts[numbers[i * 7 + 6]]++;
+    }
+
+    for (let n = 0; n < 50; n++) {
+      this.winning.push(new Int32Array(winningCounts[n]));
+      this.additional.push(new Int32Array(additionalCounts[n]));
+    }
+
+    // Filled in draw order, so every list is already sorted
+    winningCounts.fill(0);
+    additionalCounts.fill(0);
+    for (let i = 0; i < this.draws; i++) {
+      for (let j = 0; j < 6; j++) {
+        const n = numbers[i * 7 + j];
+        this.winning[n][winningCounts[n]++] = i;
+      }
+      const n = numbers[i * 7 + 6];
+      this.additional[n][additionalCounts[n]++] = i;
+    }
+  }
+
+  /**
+   * Parse a results CSV (Date plus 7 number columns) or a simulated draws CSV (Num1 - Num7, no dates)
+   */
+  static fromCsv(csv: string): DrawIndex {
+    const lines = csv.split('\n').map(line => line.trim()).filter(line => line);
+    const headers = lines[0].split(',').map(header => header.trim());
+    const dateColumn = headers.indexOf('Date');
+    const numberColumns = headers.map((_, i) => i).filter(i => i !== dateColumn).slice(0, 7);
+
+    const rows: { date: string; values: number[] }[] = [];
+    for (let i = 1; i < lines.length; i++) {
+      const values = lines[i].split(',');
+      const numbers = numberColumns.map(column => parseInt(values[column], 10));
+      if (numbers.some(n => !(n >= 1 && n <= 49))) continue;
+      rows.push({ date: dateColumn >= 0 ? values[dateColumn].trim() : '', values: numbers });
+    }
+
+    // Results are listed newest first, index them oldest first (stable for equal dates)
+    if (dateColumn >= 0) {
+      rows.reverse();
+      rows.sort((a, b) => (a.date < b.date ? -1 : a.date > b.date ? 1 : 0));
+    }
+
+    const numbers = new Uint8Array(rows.length * 7);
+    rows.forEach((row, i) => numbers.set(row.values, i * 7));
+
+    return new DrawIndex(dateColumn >= 0 ? rows.map(row => row.date) : null, numbers);
+  }
+
+  /**
+   * Draw indexes [lo, hi) dated from..to (both inclusive), all draws without a date filter
+   */
+  dateRange(from?: string, to?: string): [number, number] {
+    if (!from && !to) return [0, this.draws];
+    if (!this.dates) throw new Error('This history has no dates');
+
+    const lo = from ? lowerBound(this.dates, from, 0, this.draws) : 0;
+    const hi = to ? lowerBound(this.dates, to, lo, this.draws, true) : this.draws;
+    return [lo, hi];
+  }
+
+  /**
+   * Ascending indexes of the draws in [lo, hi) matching every number filter,
+   * by intersecting the posting lists (shortest first), or null if there is no number filter
+   */
+  matching(lo: number, hi: number, contains: number[] = [], additional?: number): Int32Array | null {
+    const lists = contains.map(n => this.winning[n]);
+    if (additional !== undefined) lists.push(this.additional[additional]);
+    if (!lists.length) return null;
+
+    // Only the part of each list inside the date range
+    const slices = lists
+      .map(list => list.subarray(lowerBound(list, lo, 0, list.length), lowerBound(list, hi, 0, list.length)))
+      .sort((a, b) => a.length - b.length);
+
+    let result = slices[0];
+    for (const list of slices.slice(1)) {
+      const next = new Int32Array(result.length);
+      let size = 0;
+      let start = 0;
+      for (const draw of result) {
+        start = lowerBound(list, draw, start, list.length);
+        if (start < list.length && list[start] === draw) next[size++] = draw;
+      }
+      result = next.subarray(0, size);
+    }
+    return result;
+  }
+
+  /**
+   * One draw as a result row, only the requested fields
+   */
+  row(draw: number, fields: readonly ResultField[] = RESULT_FIELDS): Partial<TotoResult> {
+    const row: Record<string, string | number> = {};
+    for (const field of fields) {
+      if (field === 'Date') {
+        if (this.dates) row.Date = this.dates[draw];
+      } else {
+        row[field] = this.numbers[draw * 7 + RESULT_FIELDS.indexOf(field) - 1];
+      }
+    }
+    return row as Partial<TotoResult>;
+  }
+
+  /**
+   * One page of the draws matching a query, newest first unless order is 'asc'
+   */
+  query(query: DrawQuery, fields: readonly ResultField[] = RESULT_FIELDS): DrawPage {
+    const [lo, hi] = this.dateRange(query.from, query.to);
+    const matches = this.matching(lo, hi, query.contains, query.additional);
+    const total = matches ? matches.length : Math.max(hi - lo, 0);
+    const offset = Math.min(query.offset ?? 0, total);
+    const limit = query.limit ?? 50;
+    const descending = query.order !== 'asc';
+
+    // Position k of the page counted from the newest (or oldest) match
+    const data: Partial<TotoResult>[] = [];
+    for (let k = offset; k < Math.min(offset + limit, total); k++) {
+      const position = descending ? total - 1 - k : k;
+      data.push(this.row(matches ? matches[position] : lo + position, fields));
+    }
+
+    return { total, offset, limit, data };
+  }
+}
@@ -43,4 +43,31 @@ export interface StatisticalSummary {
   leastFrequentNumbers: NumberFrequency[];
   positionAnalysis: PositionAnalysis[];
   overallFrequency: NumberFrequency[];
+}
+
+export interface NumberGap {
+  number: number;
+  drawsSince: number;
+  appearances: number;
+  meanGap: number | null;
+  maxGap: number;
+}
+
+// Precomputed by stats_artifact.py (ARTIFACT_VERSION), served by /api/toto-data
+export interface TotoStats {
+  version: number;
+  generatedAt: string;
+  source: {
+    file: string;
+    sha256: string;
+    draws: number;
+  };
+  summary: StatisticalSummary;
+  gaps: NumberGap[];
+  predictions: PredictionResult[];
+  chartData: {
+    frequencyChart: { number: number; frequency: number }[];
+    confidenceIntervals: { number: number; percentage: number; lower: number; upper: number; expected: number }[];
+  };
+  recentDraws: TotoResult[];
 } 
\ No newline at end of file
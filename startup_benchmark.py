@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the entry point scripts
+Imports each entry point in a fresh interpreter with `python -X importtime`
+and checks it stays within its cold start budget
+
+Usage: python startup_benchmark.py [runs]
+"""
+
+import os
+import subprocess
+import sys
+
+# Cold start budget (ms of import time) for each entry point and heavy
+# packages it must not import before the user picks a feature that needs them
+BUDGETS = {
+    "main": {"budget_ms": 100, "forbidden": ["pandas", "matplotlib", "scipy", "seaborn", "requests", "bs4"]},
+    "auto_update": {"budget_ms": 100, "forbidden": ["pandas", "matplotlib", "scipy", "seaborn", "requests", "bs4"]},
+    "setup_cron": {"budget_ms": 100, "forbidden": ["pandas", "matplotlib", "scipy", "seaborn", "requests", "bs4"]},
+}
+
+
+
+def measure_imports(module):
+    """
+    Import a module in a fresh interpreter and parse the -X importtime report
+
+    Returns the cumulative import time (microseconds) of every imported module
+    """
+    project_path = os.path.abspath(os.path.dirname(__file__))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=project_path, capture_output=True, text=True)
+
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+    # Lines look like: "import time:       self [us] |  cumulative | imported package"
+    imports = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        imports[name.strip()] = int(cumulative)
+
+    return imports
+
+
+
+def check_entry_point(module, budget_ms, forbidden, runs=3):
+    """
+    Check one entry point against its budget, best of runs to reduce noise
+    """
+    best = None
+    for _ in range(runs):
+        imports = measure_imports(module)
+        if best is None or imports[module] < best[module]:
+            best = imports
+
+    elapsed_ms = best[module] / 1000
+    loaded = [name for name in forbidden if name in best]
+    ok = elapsed_ms <= budget_ms and not loaded
+
+    status = "✅" if ok else "❌"
+    print(f"{status} {module}: {elapsed_ms:.1f} ms (budget {budget_ms} ms)")
+
+    if loaded:
+        print(f"   Heavy packages imported at startup: {', '.join(loaded)}")
+
+    if not ok:
+        # Show what is taking the time
+        top_level = sorted(((t, name) for name, t in best.items() if "." not in name and name != module), reverse=True)
+        for t, name in top_level[:5]:
+            print(f"   {name}: {t / 1000:.1f} ms")
+
+    return ok
+
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    print("=" * 60)
+    print("Startup Benchmark".center(60))
+    print("-" * 60)
+
+    results = [check_entry_point(module, runs=runs, **budget) for module, budget in BUDGETS.items()]
+    sys.exit(0 if all(results) else 1)
+
+
+
+if __name__ == "__main__":
+    main()
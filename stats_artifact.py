@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Precomputed statistics for the web app
+
+Computes frequencies, confidence intervals, gaps and predictions from the
+cleaned results (the same shared dataset the Python analysis uses) once
+and writes them as one versioned JSON file, which the /api/toto-data
+route serves as is (the browser does no analysis)
+
+Usage: python stats_artifact.py [results.csv] [output.json]
+results.csv is any file in the toto_results.csv layout (Date, Winning Number 1, ...)
+"""
+
+# Importing relevant libraries
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime
+import numpy as np
+from confidence_intervals import corrected_alpha, interval_bounds
+from dataset import count_matrix, get_dataset
+from gap_index import GapIndex, RESULTS_COLUMNS
+
+
+
+# Bump when the layout of the artifact changes (src/types/toto.ts TotoStats)
+ARTIFACT_VERSION = 1
+
+# Served by the Next.js app from its public folder
+STATS_FILE = os.path.join("public", "toto_stats.json")
+
+COLUMN_NAMES = ['Num1', 'Num2', 'Num3', 'Num4', 'Num5', 'Num6', 'Num7']
+TOP = 10
+RECENT_DRAWS = 20
+HOT_WINDOW = 5
+
+
+
+def number_frequencies(counts, draws):
+    """
+    NumberFrequency rows for numbers 1-49, counts is the (50,) count of each number over Num1 - Num7
+
+    A number is in a draw at most once, so percentage is the share of draws
+    containing it, with a 95% Wilson interval (Bonferroni corrected, all 49 hold together)
+    """
+    lower, upper = interval_bounds(counts[1:], draws, alpha=corrected_alpha(0.05, 49))
+
+    return [{
+        'number': number,
+        'frequency': int(counts[number]),
+        'percentage': round(100 * counts[number] / max(draws, 1), 3),
+        'confidenceInterval': {'lower': round(100 * lower[number - 1], 3), 'upper': round(100 * upper[number - 1], 3)},
+    } for number in range(1, 50)]
+
+
+
+def position_analysis(numbers, position_counts, top=3):
+    """
+    Most and least frequent numbers and the average value of each column
+    """
+    analysis = []
+
+    for i, name in enumerate(COLUMN_NAMES):
+        # Only numbers that appeared in this column (Num1 rarely sees 40s)
+        seen = np.flatnonzero(position_counts[i])
+        ranked = seen[np.argsort(-position_counts[i][seen], kind="stable")]
+
+        analysis.append({
+            'position': name,
+            'mostFrequent': ranked[:top].tolist(),
+            'leastFrequent': ranked[::-1][:top].tolist(),
+            'average': round(float(numbers[:, i].mean()), 3) if len(numbers) else 0.0,
+        })
+
+    return analysis
+
+
+
+def gap_rows(index):
+    """
+    Draws since each number last appeared with its gap statistics, most overdue first
+    """
+    table = index.overdue_table()
+
+    return [{
+        'number': int(row.number),
+        'drawsSince': int(row.draws_since),
+        'appearances': int(row.appearances),
+        'meanGap': None if np.isnan(row.mean_gap) else round(float(row.mean_gap), 2),
+        'maxGap': int(row.max_gap),
+    } for row in table.itertuples()]
+
+
+
+def predictions(numbers, frequencies, position_counts, index):
+    """
+    Deterministic tickets for each prediction method shown in the app
+    """
+    # Numbers ordered by overall count, ties broken by the smaller number
+    ranked = (np.argsort(-frequencies[1:], kind="stable") + 1).tolist()
+    hot_counts = count_matrix(numbers[-HOT_WINDOW:, :6]).sum(axis=0)
+    hot = (np.argsort(-hot_counts[1:], kind="stable") + 1).tolist()
+    overdue = [row['number'] for row in gap_rows(index)]
+
+    # Most frequent number per column that was not already picked
+    by_position = []
+    for counts in position_counts[:6]:
+        for number in np.argsort(-counts[1:], kind="stable") + 1:
+            if number not in by_position:
+                by_position.append(int(number))
+                break
+
+    balanced = ranked[:3] + [n for n in overdue if n not in ranked[:3]][:3]
+
+    methods = [
+        ('Most Frequent Numbers', ranked[:6], 0.25, 'Based on historical frequency analysis across all positions'),
+        ('Position-Based Analysis', by_position, 0.30, 'Selecting most frequent number for each position (1-6)'),
+        ('Hot Numbers', hot[:6], 0.20, f'Most frequent numbers in the last {HOT_WINDOW} draws'),
+        ('Cold Numbers', overdue[:6], 0.15, 'Numbers that have gone the longest without being drawn'),
+        ('Balanced Approach', balanced, 0.35, 'Three most frequent and three most overdue numbers'),
+    ]
+
+    return [{'method': method, 'numbers': sorted(picks), 'confidence': confidence, 'reasoning': reasoning}
+            for method, picks, confidence, reasoning in methods]
+
+
+
+def build_stats(data):
+    """
+    Everything the web app displays, computed from a loaded (cleaned) results dataset
+    """
+    with open(data.file, "rb") as f:
+        sha256 = hashlib.sha256(f.read()).hexdigest()
+
+    # Oldest first, so the last rows are the latest draws
+    dates, numbers = data.dates, data.history
+    draws = len(numbers)
+
+    position_counts = count_matrix(numbers)
+    frequencies = position_counts.sum(axis=0)
+    index = GapIndex.build(numbers, dates[-1] if draws else "")
+
+    overall = number_frequencies(frequencies, draws)
+    ranked = sorted(overall, key=lambda row: -row['frequency'])
+
+    recent = [dict(zip(['Date'] + RESULTS_COLUMNS, [date] + draw.tolist()))
+              for date, draw in zip(dates[::-1][:RECENT_DRAWS], numbers[::-1][:RECENT_DRAWS])]
+
+    return {
+        'version': ARTIFACT_VERSION,
+        'generatedAt': datetime.now().isoformat(timespec="seconds"),
+        'source': {'file': os.path.basename(data.file), 'sha256': sha256, 'draws': draws},
+        'summary': {
+            'totalDraws': draws,
+            'dateRange': {'start': str(dates[0]) if draws else "", 'end': str(dates[-1]) if draws else ""},
+            'mostFrequentNumbers': ranked[:TOP],
+            'leastFrequentNumbers': ranked[::-1][:TOP],
+            'positionAnalysis': position_analysis(numbers, position_counts),
+            'overallFrequency': overall,
+        },
+        'gaps': gap_rows(index),
+        'predictions': predictions(numbers, frequencies, position_counts, index),
+        'chartData': {
+            'frequencyChart': [{'number': row['number'], 'frequency': row['frequency']} for row in overall],
+            'confidenceIntervals': [{'number': row['number'], 'percentage': row['percentage'],
+                                     'lower': row['confidenceInterval']['lower'],
+                                     'upper': row['confidenceInterval']['upper'],
+                                     'expected': round(100 * 7 / 49, 3)} for row in overall],
+        },
+        'recentDraws': recent,
+    }
+
+
+
+def write_stats(file="toto_results.csv", output=STATS_FILE):
+    """
+    Build the stats artifact and write it atomically (the web app never sees a half written file)
+
+    Rows with errors are skipped without asking, scheduled runs have nobody to answer
+    """
+    if not os.path.exists(file):
+        print(f"❌ {file} not found")
+        return False
+
+    data = get_dataset(file, prompt=False)
+    if data is None:
+        print(f"❌ {file} could not be loaded")
+        return False
+    if data.dates is None:
+        print(f"❌ {file} has no draw dates, expected the toto_results.csv layout")
+        return False
+
+    try:
+        stats = build_stats(data)
+    except Exception as e:
+        print(f"❌ Error building stats: {e}")
+        return False
+
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    tmp_path = output + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(stats, f, separators=(",", ":"))
+    os.replace(tmp_path, output)
+
+    print(f"✅ Stats for {stats['source']['draws']} draws written to {output} ({os.path.getsize(output) / 1024:.1f} KB)")
+    return True
+
+
+
+def main():
+    file = sys.argv[1] if len(sys.argv) > 1 else "toto_results.csv"
+    output = sys.argv[2] if len(sys.argv) > 2 else STATS_FILE
+    sys.exit(0 if write_stats(file, output) else 1)
+
+
+
+if __name__ == "__main__":
+    main()
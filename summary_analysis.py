@@ -1,23 +1,119 @@
-import clean_data
+import dataset
+import goodness_of_fit
+from chart_cache import chart_fingerprint, is_current, save_metadata
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 
-def analyze_and_compare():
+def pattern_statistics(numbers):
+    """
+    Pattern statistics of every draw, computed with array operations over all draws at once
+
+    numbers is an (N, 6) or (N, 7) array of draws, only Num1-Num6 are used.
+    Returns a DataFrame with one row per draw:
+      sum, even, low (1-24), high (25-49), decades (distinct tens groups),
+      consecutive_pairs, has_consecutive, max_run (longest run of consecutive
+      numbers), min_gap and max_gap (between neighbouring sorted numbers)
+    """
+    winning = np.sort(np.asarray(numbers)[:, :6], axis=1)
+    gaps = np.diff(winning, axis=1)
+    consecutive = gaps == 1
+    
+    # Longest run of consecutive numbers, 5 column steps each over all draws
+    run = np.zeros(len(winning), dtype=np.int64)
+    longest = np.zeros(len(winning), dtype=np.int64)
+    for j in range(consecutive.shape[1]):
+        run = (run + 1) * consecutive[:, j]
+        np.maximum(longest, run, out=longest)
+    
+    # Numbers are sorted so their decades are too, count the changes
+    decades = 1 + (np.diff(winning // 10, axis=1) != 0).sum(axis=1)
+    low = (winning <= 24).sum(axis=1)
+    
+    return pd.DataFrame({
+        'sum': winning.sum(axis=1),
+        'even': (winning % 2 == 0).sum(axis=1),
+        'low': low,
+        'high': 6 - low,
+        'decades': decades,
+        'consecutive_pairs': consecutive.sum(axis=1),
+        'has_consecutive': consecutive.any(axis=1),
+        'max_run': longest + 1,
+        'min_gap': gaps.min(axis=1),
+        'max_gap': gaps.max(axis=1),
+    })
+
+def comparison_chart(real_counts, sim_counts, real_draws, sim_draws, path='images/comparison_analysis.png', show=True):
+    """
+    Bar charts of real vs simulated number frequencies, saved to path
+
+    real_counts and sim_counts are Series of counts indexed by number 1-49.
+    show=False only saves the chart (headless rendering). The chart is not
+    drawn or saved again while its counts are unchanged, unless it is shown
+    """
+    fingerprint = chart_fingerprint(real_counts.to_numpy(), sim_counts.to_numpy(), chart="comparison",
+                                    real_draws=real_draws, sim_draws=sim_draws, dpi=300)
+    saved = is_current(path, fingerprint)
+    
+    if saved and not show:
+        print(f"⏭️  {path} unchanged, skipped")
+        return
+    
+    # matplotlib only imported here so the pattern statistics can be used
+    # without it, e.g. in resampling workers
+    import matplotlib.pyplot as plt
+    
+    expected_freq = real_draws * 7 / 49  # 7 numbers per draw, 49 possible numbers
+    
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
+    
+    # Real data frequency
+    real_counts.plot(kind='bar', ax=ax1, color='blue', alpha=0.7)
+    ax1.set_title(f'Real TOTO Data - Number Frequencies ({real_draws} draws)')
+    ax1.set_xlabel('Number')
+    ax1.set_ylabel('Frequency')
+    ax1.axhline(y=expected_freq, color='red', linestyle='--', label=f'Expected ({expected_freq:.1f})')
+    ax1.legend()
+    ax1.grid(True, alpha=0.3)
+    
+    # Simulated data frequency (sample)
+    sim_sample = sim_counts.sample(n=49, random_state=42)  # Sample for visualization
+    sim_sample.plot(kind='bar', ax=ax2, color='green', alpha=0.7)
+    ax2.set_title(f'Simulated Data - Number Frequencies ({sim_draws} draws, sampled)')
+    ax2.set_xlabel('Number')
+    ax2.set_ylabel('Frequency')
+    ax2.axhline(y=sim_counts.mean(), color='red', linestyle='--', label=f'Expected ({sim_counts.mean():.0f})')
+    ax2.legend()
+    ax2.grid(True, alpha=0.3)
+    
+    plt.tight_layout()
+    if not saved:
+        plt.savefig(path, dpi=300, bbox_inches='tight', metadata=save_metadata(fingerprint))
+    
+    # Closed after showing too, a non-interactive backend (Agg) returns from show() right away
+    if show:
+        plt.show()
+    plt.close(fig)
+
+def analyze_and_compare(real=None, sim=None, show=True):
     """
     Compare real TOTO data with simulated data
+
+    real and sim are shared datasets (dataset.TotoDataset), loaded here if not given.
+    show=False only saves the comparison chart (scheduled / headless runs)
     """
     print("=" * 60)
     print("TOTO Data Analysis Summary".center(60))
     print("=" * 60)
     
-    # Load both datasets
+    # Load both datasets (only if not already loaded in this process)
     print("Loading datasets...")
-    real_data, real_cols = clean_data.load_data('toto_results.csv')
-    sim_data, sim_cols = clean_data.load_data('simulated_draws.csv')
+    if real is None:
+        real = dataset.get_dataset('toto_results.csv')
+    if sim is None:
+        sim = dataset.get_dataset('simulated_draws.csv')
     
-    # Clean real data
-    clean_real = clean_data.clean_data(real_data)
+    clean_real, real_cols = real.results, real.column_names
+    sim_data = sim.results
     
     print(f"\n📊 DATASET COMPARISON:")
     print(f"Real TOTO data: {len(clean_real)} draws")
@@ -28,12 +124,10 @@ def analyze_and_compare():
     print(f"\n📈 OVERALL FREQUENCY ANALYSIS:")
     
     # Real data frequencies
-    real_all_numbers = pd.concat([clean_real[col] for col in clean_real.columns])
-    real_counts = real_all_numbers.value_counts().sort_index()
+    real_counts = pd.Series(real.frequencies[1:], index=range(1, 50))
     
     # Simulated data frequencies
-    sim_all_numbers = pd.concat([sim_data[col] for col in sim_data.columns])
-    sim_counts = sim_all_numbers.value_counts().sort_index()
+    sim_counts = pd.Series(sim.frequencies[1:], index=range(1, 50))
     
     print(f"\nReal data - Most frequent numbers:")
     print(real_counts.nlargest(5))
@@ -48,83 +142,44 @@ def analyze_and_compare():
     # Position analysis
     print(f"\n🎯 POSITION ANALYSIS (Real Data):")
     for i, col in enumerate(real_cols[:6]):  # Num1-Num6 only
-        col_counts = clean_real[col].value_counts()
-        most_common = col_counts.head(3)
-        print(f"{col}: Most common = {list(most_common.index)}")
+        most_common = np.argsort(-real.position_counts[i], kind="stable")[:3]
+        print(f"{col}: Most common = {most_common.tolist()}")
     
     # Statistical tests
     print(f"\n📊 STATISTICAL INSIGHTS:")
     
-    # Chi-square test for uniformity (simplified)
-    real_std = real_counts.std()
-    sim_std = sim_counts.std()
+    # Goodness of fit against a fair draw, computed from the counts alone
+    # (Num1-Num6 against their exact sorted-order distribution)
+    fit = goodness_of_fit.goodness_of_fit(real.position_counts)
     
-    print(f"Standard deviation of frequencies:")
-    print(f"  Real data: {real_std:.2f}")
-    print(f"  Simulated: {sim_std:.2f}")
-    print(f"  Ratio (Real/Sim): {real_std/sim_std:.2f}")
+    print(f"Goodness of fit (real data vs fair draw, p < 0.05 suggests bias):")
+    print(fit[['position', 'chi2', 'dof', 'chi2_p', 'g_p', 'ks_d', 'ks_p']].round(3).to_string(index=False))
     
     # Check for any obvious patterns
     print(f"\n🔍 PATTERN ANALYSIS:")
     
-    # Check for consecutive numbers
-    consecutive_count = 0
-    for _, row in clean_real.iterrows():
-        numbers = sorted([row[col] for col in real_cols[:6]])
-        for i in range(len(numbers)-1):
-            if numbers[i+1] - numbers[i] == 1:
-                consecutive_count += 1
-                break
+    # All pattern statistics for both datasets in one vectorized pass each
+    real_patterns = pattern_statistics(real.numbers)
+    sim_patterns = pattern_statistics(sim.numbers)
     
+    consecutive_count = int(real_patterns['has_consecutive'].sum())
     print(f"Draws with consecutive numbers: {consecutive_count}/{len(clean_real)} ({consecutive_count/len(clean_real)*100:.1f}%)")
     
-    # Check for even/odd distribution
-    even_counts = []
-    for _, row in clean_real.iterrows():
-        numbers = [row[col] for col in real_cols[:6]]
-        even_count = sum(1 for num in numbers if num % 2 == 0)
-        even_counts.append(even_count)
-    
-    avg_even = np.mean(even_counts)
-    print(f"Average even numbers per draw: {avg_even:.1f}/6 (expected: 3.0)")
+    avg_even = real_patterns['even'].mean()
+    print(f"Average even numbers per draw: {avg_even:.1f}/6 (expected: {6 * 24 / 49:.2f})")
     
-    # Sum analysis
-    sums = []
-    for _, row in clean_real.iterrows():
-        numbers = [row[col] for col in real_cols[:6]]
-        sums.append(sum(numbers))
-    
-    avg_sum = np.mean(sums)
+    avg_sum = real_patterns['sum'].mean()
     expected_sum = 6 * 25  # Average of 1-49 is 25
     print(f"Average sum per draw: {avg_sum:.1f} (expected: {expected_sum})")
     
+    # Average of every pattern statistic, real vs simulated
+    pattern_means = pd.DataFrame({'Real': real_patterns.mean(), 'Simulated': sim_patterns.mean()})
+    print(f"\nAverage per draw (Num1-Num6):")
+    print(pattern_means.round(2))
+    
     # Create visualization
     print(f"\n📊 CREATING COMPARISON CHART...")
-    
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
-    
-    # Real data frequency
-    real_counts.plot(kind='bar', ax=ax1, color='blue', alpha=0.7)
-    ax1.set_title('Real TOTO Data - Number Frequencies (50 draws)')
-    ax1.set_xlabel('Number')
-    ax1.set_ylabel('Frequency')
-    ax1.axhline(y=expected_freq, color='red', linestyle='--', label=f'Expected ({expected_freq:.1f})')
-    ax1.legend()
-    ax1.grid(True, alpha=0.3)
-    
-    # Simulated data frequency (sample)
-    sim_sample = sim_counts.sample(n=49, random_state=42)  # Sample for visualization
-    sim_sample.plot(kind='bar', ax=ax2, color='green', alpha=0.7)
-    ax2.set_title('Simulated Data - Number Frequencies (1M draws, sampled)')
-    ax2.set_xlabel('Number')
-    ax2.set_ylabel('Frequency')
-    ax2.axhline(y=sim_counts.mean(), color='red', linestyle='--', label=f'Expected ({sim_counts.mean():.0f})')
-    ax2.legend()
-    ax2.grid(True, alpha=0.3)
-    
-    plt.tight_layout()
-    plt.savefig('images/comparison_analysis.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    comparison_chart(real_counts, sim_counts, len(clean_real), len(sim_data), show=show)
     
     print(f"\n✅ ANALYSIS COMPLETE!")
     print(f"Chart saved as: images/comparison_analysis.png")
@@ -133,7 +188,10 @@ def analyze_and_compare():
         'real_data': clean_real,
         'sim_data': sim_data,
         'real_frequencies': real_counts,
+        'real_goodness_of_fit': fit,
         'sim_frequencies': sim_counts,
+        'real_patterns': real_patterns,
+        'sim_patterns': sim_patterns,
         'consecutive_rate': consecutive_count/len(clean_real),
         'avg_even': avg_even,
         'avg_sum': avg_sum
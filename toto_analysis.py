@@ -1,59 +1,85 @@
 # Importing relevant libraries
+import os
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
-from scipy.stats import norm
-import seaborn as sns
-from collections import defaultdict
+import order_statistics
+from chart_cache import chart_fingerprint, is_current, save_metadata
+from co_occurrence import CoOccurrence
+from dataset import count_matrix
+
+
+
+# Count matrix (7, 50) of each number per column, every chart reads from it
+# A dataset (dataset.TotoDataset) keeps it cached, a DataFrame is counted in one pass
+def number_counts(results):
+    if hasattr(results, "position_counts"):
+        return results.position_counts
+    return count_matrix(results.to_numpy())
+
+
+
+# Show the chart, or save it as save_dir/file_name and close it when rendering headless
+# The fingerprint of the chart's inputs is stored in the PNG so an unchanged chart can be skipped next time
+def show_or_save(file_name, save_dir=None, dpi=100, fingerprint=None):
+    if save_dir is None:
+        plt.show()
+    else:
+        plt.savefig(os.path.join(save_dir, file_name), dpi=dpi, bbox_inches='tight', metadata=save_metadata(fingerprint))
+        plt.close()
+
+
+
+# True if save_dir/file_name was already saved from the same inputs (never when showing)
+def chart_is_current(file_name, save_dir, fingerprint):
+    return save_dir is not None and is_current(os.path.join(save_dir, file_name), fingerprint)
 
 
 
 # Plot value counts for each column indivudually (Num1 - Num7)
-def individual_bar_chart(results, column_names):
+def individual_bar_chart(results, column_names, save_dir=None, prefix=""):
     
+    # Counts of every number in every column
+    counts = number_counts(results)
+
     # Loop for each number (Num1 - Num7)
     for name in column_names:
 
-        # Get results for selected row, count the number of times it appears, and sort them numerically
-        counts = results[name].value_counts().sort_index()
+        # Skip charts whose counts did not change since they were saved
+        fingerprint = chart_fingerprint(counts[column_names.index(name)], chart="individual", column=name, draws=len(results))
+        if chart_is_current(f'{prefix}{name}_Freq.png', save_dir, fingerprint):
+            continue
+
+        # Counts for selected column, numbers 1-49
+        full_counts = pd.Series(counts[column_names.index(name), 1:], index=range(1, 50))
 
-        # Add missing numbers if any (count = 0)
-        full_counts = pd.Series(index=range(1, 50), dtype=int).add(counts, fill_value=0)
+        # Expected counts for a fair draw (Num1 - Num6 are sorted so each has its own shape)
+        expected = order_statistics.expected_counts(len(results), [column_names.index(name)])[0]
 
-        # Plot bar chart
-        full_counts.plot(kind='bar', figsize=(10, 4))
+        # Plot bar chart with expected counts on top
+        full_counts.plot(kind='bar', figsize=(10, 4), label='Observed')
+        plt.plot(np.arange(49), expected, color='red', linestyle='--', marker='.', label='Expected (fair draw)')
         plt.xticks(ticks=np.arange(49), labels=np.arange(1, 50), rotation=90)
         plt.xlabel('Value')
         plt.ylabel('Count')
         plt.title(f'{name} Counts')
         plt.grid(axis='y', linestyle='--', alpha=0.7)
+        plt.legend()
         plt.tight_layout()
-        plt.show()
+        show_or_save(f'{prefix}{name}_Freq.png', save_dir, fingerprint=fingerprint)
 
 
 
 # Plot value counts for each column together (Num1 - Num6)
-def grouped_bar_chart(results, column_names):
+def grouped_bar_chart(results, column_names, save_dir=None, prefix=""):
     
-    # Define empty dataset to store Num1 - Num6
-    datasets = []
-
-    # Loop for each number from Num1 - Num6
-    for name in column_names[:6]:
+    # Counts for Num1 - Num6 in 1 dataframe, one column each
+    counts = number_counts(results)
+    fingerprint = chart_fingerprint(counts[:6], chart="grouped", columns=column_names[:6], draws=len(results))
+    if chart_is_current(f'{prefix}Grouped_Freq.png', save_dir, fingerprint):
+        return
 
-        # Get results for selected row, count the number of times it appears, and sort them numerically
-        counts = results[name].value_counts().sort_index()
-        
-        # Add missing numbers if any (count = 0)
-        full_counts = pd.Series(index=range(1, 50), dtype=int).add(counts, fill_value=0)
-
-        # Add counts into dataset
-        datasets.append(full_counts)
-
-    # Combine into 1 dataframe
-    df_combined = pd.concat(datasets, axis=1)
-    df_combined.columns = column_names[:6]
-    df_combined = df_combined.fillna(0)
+    df_combined = pd.DataFrame(counts[:6, 1:].T, index=range(1, 50), columns=column_names[:6])
 
     # Define variables for bar chart
     n_categories = 49
@@ -65,9 +91,13 @@ def grouped_bar_chart(results, column_names):
     # Plot bar chart
     fig, ax = plt.subplots(figsize=(18, 8))
 
+    # Expected counts per column for a fair draw
+    expected = order_statistics.expected_counts(len(results), range(n_datasets))
+
     # Loop through and plot each column shifted horizontally to group by number (each number contains Num1 - Num6 counts)
     for i, col in enumerate(df_combined.columns):
         ax.bar(indices + i * bar_width, df_combined[col], width=bar_width, label=col, color=colors[i])
+        ax.plot(indices + i * bar_width, expected[i], color=colors[i], linestyle='--', linewidth=1)
 
     # Center x-ticks
     ax.set_xticks(indices + bar_width * (n_datasets - 1) / 2)
@@ -79,24 +109,66 @@ def grouped_bar_chart(results, column_names):
     ax.grid(axis='y', linestyle='--', alpha=0.7)
     ax.legend()
     plt.tight_layout()
-    plt.show()
+    show_or_save(f'{prefix}Grouped_Freq.png', save_dir, fingerprint=fingerprint)
+
+
+
+# Plot how often each pair of numbers is drawn together (Num1 - Num6) compared to chance
+def co_occurrence_chart(results, top=10, save_dir=None, prefix=""):
+
+    # Pair and triplet counts kept on the dataset (saved and updated with new draws),
+    # otherwise count all pairs and triplets with one-hot matrix products
+    if hasattr(results, "co_occurrence"):
+        co_occurrence = results.co_occurrence
+    else:
+        numbers = results.numbers if hasattr(results, "numbers") else results.to_numpy()
+        co_occurrence = CoOccurrence.from_numbers(numbers)
+
+    # Print pairs and triplets that appear the most (not when saving charts in a batch)
+    if save_dir is None:
+        print(f"Most frequent pairs (expected {co_occurrence.expected_pair():.2f} each):")
+        print(co_occurrence.pair_table(top).round(2).to_string(index=False))
+        print(f"\nMost frequent triplets (expected {co_occurrence.expected_triplet():.2f} each):")
+        print(co_occurrence.triplet_table(top).round(2).to_string(index=False))
+
+    # Skip the chart if the pair counts did not change since it was saved
+    fingerprint = chart_fingerprint(co_occurrence.pairs, chart="co_occurrence", draws=co_occurrence.draws)
+    if chart_is_current(f'{prefix}Pair_CoOccurrence.png', save_dir, fingerprint):
+        return
+
+    # Observed / expected ratio for each pair (diagonal left empty)
+    ratio = co_occurrence.pairs[1:, 1:] / co_occurrence.expected_pair()
+    np.fill_diagonal(ratio, np.nan)
+
+    # Plot heatmap
+    fig, ax = plt.subplots(figsize=(12, 10))
+    image = ax.imshow(ratio, cmap='coolwarm', vmin=0, vmax=2, origin='lower')
+    ax.set_xticks(np.arange(49))
+    ax.set_xticklabels(np.arange(1, 50), rotation=90)
+    ax.set_yticks(np.arange(49))
+    ax.set_yticklabels(np.arange(1, 50))
+    ax.set_xlabel('Number')
+    ax.set_ylabel('Number')
+    ax.set_title('Pair Co-occurrence (Observed / Expected, Num1–Num6)')
+    fig.colorbar(image, ax=ax, label='Observed / Expected')
+    plt.tight_layout()
+    show_or_save(f'{prefix}Pair_CoOccurrence.png', save_dir, fingerprint=fingerprint)
 
 
 
 # Plot total number of times value appear between Num1 - Num7
-def overall_frequency_chart(results):
+def overall_frequency_chart(results, save_dir=None, prefix=""):
 
-    # Add all numbers from Num1 - Num7 into 1 dataset
-    all_numbers = pd.concat([results[col] for col in results.columns])
-    
-    # Get results for selected row, count the number of times it appears, and sort them numerically
-    counts = all_numbers.value_counts().sort_index()
+    # Add up counts of each number over Num1 - Num7
+    full_counts = pd.Series(number_counts(results).sum(axis=0)[1:], index=range(1, 50))
 
-    # Add missing numbers if any (count = 0)
-    full_counts = pd.Series(index=range(1, 50), dtype=int).add(counts, fill_value=0).astype(int)
+    fingerprint = chart_fingerprint(full_counts.to_numpy(), chart="overall")
+    if chart_is_current(f'{prefix}Overall_Freq.png', save_dir, fingerprint):
+        return
 
     # testing
-    print(full_counts)
+    if save_dir is None:
+        print(full_counts)
 
     # Plot overall frequency
     full_counts.plot(kind='bar', figsize=(12, 5), color='steelblue')
@@ -106,59 +178,99 @@ def overall_frequency_chart(results):
     plt.title('Overall Frequency of Numbers (Num1 to Num7)')
     plt.grid(axis='y', linestyle='--', alpha=0.7)
     plt.tight_layout()
+    show_or_save(f'{prefix}Overall_Freq.png', save_dir, fingerprint=fingerprint)
+
+
+
+# Plot how often numbers appeared in a rolling window of draws (trend over time)
+def rolling_frequency_chart(cube, window=50, top=5):
+
+    window = min(window, cube.draws)
+
+    # Counts for every window from the prefix sums, (windows, 50)
+    rolling = cube.rolling(window)
+
+    # Follow the numbers that are most frequent overall
+    overall = cube.overall()[1:]
+    numbers = np.argsort(-overall, kind="stable")[:top] + 1
+
+    # Plot line per number, x axis is the last draw of each window
+    x = np.arange(window, cube.draws + 1)
+    plt.figure(figsize=(12, 5))
+    for number in numbers:
+        plt.plot(x, rolling[:, number], label=f'{number}')
+    plt.axhline(y=window * 7 / 49, color='red', linestyle='--', label='Expected')
+    plt.xlabel('Draw (oldest to newest)')
+    plt.ylabel(f'Count in last {window} draws')
+    plt.title(f'Rolling {window}-Draw Frequency of the {top} Most Frequent Numbers')
+    plt.grid(axis='y', linestyle='--', alpha=0.7)
+    plt.legend()
+    plt.tight_layout()
     plt.show()
 
 
 
-# Plot 95% confidence interval 
-def confidence_interval(results):
+# Plot 95% confidence interval of each number's proportion for each column (Num1 - Num7)
+# Corrected (Bonferroni by default) since all columns x 49 intervals are looked at together
+def confidence_interval_chart(results, column_names, method="wilson", save_dir=None, prefix="",
+                              correction="bonferroni"):
+
+    from confidence_intervals import confidence_interval_table, correction_label
+
+    counts = number_counts(results)
+    table = confidence_interval_table(counts, method=method, correction=correction)
+    label = correction_label(correction)
+
+    for name in column_names:
+        fingerprint = chart_fingerprint(counts[column_names.index(name)], chart="ci", column=name, method=method,
+                                        correction=correction)
+        if chart_is_current(f'{prefix}{name}_CI.png', save_dir, fingerprint):
+            continue
+
+        rows = table[table['column'] == name]
+
+        # Proportion with interval as error bars (clipped, rounding can leave -1e-17), expected proportion on top
+        errors = np.clip([rows['proportion'] - rows['ci_lower'], rows['ci_upper'] - rows['proportion']], 0, None)
+        plt.figure(figsize=(10, 4))
+        plt.errorbar(rows['number'], rows['proportion'] * 100, yerr=errors * 100,
+                     fmt='o', markersize=3, capsize=2, label=f'Observed (95% {method} CI, {label})')
+        plt.plot(rows['number'], rows['expected'] * 100, color='red', linestyle='--', label='Expected (fair draw)')
+        plt.xticks(ticks=np.arange(1, 50), rotation=90)
+        plt.xlabel('Number')
+        plt.ylabel('%')
+        plt.title(f'{name} 95% Confidence Intervals ({label}, {table.shape[0]} intervals)')
+        plt.grid(axis='y', linestyle='--', alpha=0.7)
+        plt.legend()
+        plt.tight_layout()
+        show_or_save(f'{prefix}{name}_CI.png', save_dir, fingerprint=fingerprint)
 
-    # 95% confidence interval
-    z = norm.ppf(0.975)
 
-    # Loop for each column
-    for col in results.columns:
-        print(f"Confidence Interval for {col} (Sorted by %)".center(84))
-        num_series = results[col]
-        total_trials = len(num_series)
 
-        counts = num_series.value_counts().sort_index()
-        full_counts = pd.Series(0, index=range(1, 50)).add(counts, fill_value=0).astype(int)
+# Print 95% confidence interval for each column (Bonferroni corrected by default, correction=None for per cell intervals)
+def confidence_interval(results, method="wilson", correction="bonferroni"):
 
-        # Collect data rows for this column
-        data_rows = []
+    # scipy is only needed here, so only import it when this table is used
+    from confidence_intervals import confidence_interval_table, correction_label
 
-        # Loop for each number from 1-49 and calculate values
-        # p : proportion
-        # p_pct : percentage
-        # se : standard error
-        # ci_lower: confidence interval lower
-        # ci_upper: confidence interval upper
-        for number in range(1, 50):
-            count = full_counts[number]
-            p = count / total_trials
-            se = np.sqrt(p * (1 - p) / total_trials)
-            ci_lower = max(0, p - z * se)
-            ci_upper = min(1, p + z * se)
+    # All intervals from the count matrix in one call
+    table = confidence_interval_table(number_counts(results), method=method, correction=correction)
 
-            p_pct = p * 100
-            ci_lower_pct = ci_lower * 100
-            ci_upper_pct = ci_upper * 100
-            ci_width = ci_upper_pct - ci_lower_pct
+    # Label for the interval, e.g. "95% CI (Bonferroni)"
+    label = f"95% CI ({correction_label(correction)})"
 
-            # Store values in list
-            data_rows.append((number, count, p, p_pct, ci_lower_pct, ci_upper_pct, ci_width))
+    # Print each column sorted by percentage descending
+    for col, rows in table.groupby('column', sort=False):
+        print(f"{label} for {col}, {method} interval (Sorted by %)".center(110))
+        print(f"{'Number':>6} | {'Count':>6} | {'Proportion':>10} | {'%':>6} | {'CI Lower':>12} | {'CI Upper':>12} | {'CI Width':>12} | {'Expected':>8} | {'Residual':>8}")
+        print("-" * 110)
 
-        # Sort by percentage descending
-        data_rows.sort(key=lambda x: x[3], reverse=True)
+        for row in rows.sort_values('proportion', ascending=False, kind="stable").itertuples():
+            width = (row.ci_upper - row.ci_lower) * 100
+            flag = " *" if row.outside else ""
+            print(f"{row.number:6d} | {row.count:6d} | {row.proportion:10.4f} | {row.proportion * 100:5.1f}% | {row.ci_lower * 100:11.1f}% | {row.ci_upper * 100:11.1f}% | {width:11.1f}% | {row.expected * 100:7.1f}% | {row.residual:8.2f}{flag}")
 
-        # Print header
-        print(f"{'Number':>6} | {'Count':>6} | {'Proportion':>10} | {'%':>6} | {'95% CI Lower':>12} | {'95% CI Upper':>12} | {'CI Width':>12}")
-        print("-" * 84)
+        print("-" * 110)
 
-        # loop through list and print results
-        for row in data_rows:
-            number, count, p, p_pct, ci_lower_pct, ci_upper_pct, ci_width = row
-            print(f"{number:6d} | {count:6d} | {p:10.4f} | {p_pct:5.1f}% | {ci_lower_pct:11.1f}% | {ci_upper_pct:11.1f}% | {ci_width:11.1f}%")
+    print("* expected % for a fair draw lies outside the interval")
 
-        print("-" * 84)
+    return table
\ No newline at end of file